@@ -17,11 +17,73 @@ Prerequisites:
 
 from ultralytics import YOLO
 import cv2
+import torch
 import numpy as np
 from pathlib import Path
 import json
 import time
 import subprocess
+import tempfile
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; overlay smoothing then runs as plain Python
+    njit = None
+
+# Using yolo11s (small) for better accuracy in challenging conditions
+MODEL_NAME = "yolo11s.pt"
+
+# On CUDA machines run inference on the GPU in FP16; CPU keeps the FP32 defaults
+INFERENCE_KWARGS = (
+    {"device": 0, "half": True, "imgsz": 640} if torch.cuda.is_available() else {}
+)
+
+# Frames decoded and sent through YOLO per forward pass in track_player
+FRAME_BATCH_SIZE = 16
+
+# Draw and resize preview frames through OpenCV's T-API when an OpenCL device exists
+USE_OPENCL = cv2.ocl.haveOpenCL()
+
+_model = None
+
+
+def model_weights_path() -> str:
+    """
+    Pick the weights to load for MODEL_NAME.
+
+    On CUDA machines the model is exported once to a TensorRT FP16 engine next to
+    the .pt (fixed 640 input, dynamic batch up to FRAME_BATCH_SIZE) and the engine
+    is used from then on. Without CUDA, or if the export fails, the .pt is used.
+    """
+    if not torch.cuda.is_available():
+        return MODEL_NAME
+
+    engine = Path(MODEL_NAME).with_suffix(".engine")
+    if not engine.exists():
+        print(f"Exporting {MODEL_NAME} to TensorRT FP16 (one-time)...")
+        try:
+            YOLO(MODEL_NAME).export(
+                format="engine",
+                half=True,
+                batch=FRAME_BATCH_SIZE,
+                dynamic=True,
+                imgsz=640,
+                device=0,
+            )
+        except Exception as e:
+            print(f"Warning: TensorRT export failed, using {MODEL_NAME}: {e}")
+            return MODEL_NAME
+    return str(engine)
+
+
+def get_model():
+    """Return the shared YOLO model, loading weights (downloads on first run) once."""
+    global _model
+    if _model is None:
+        # Input shape is fixed per video, so let cuDNN pick the fastest conv algorithms
+        torch.backends.cudnn.benchmark = torch.cuda.is_available()
+        _model = YOLO(model_weights_path(), task="detect")
+    return _model
 
 
 def detect_players(video_path: str, frame_index: int = 0):
@@ -38,9 +100,7 @@ def detect_players(video_path: str, frame_index: int = 0):
     """
     print(f"\n=== Detecting players in frame {frame_index} ===")
 
-    # Load YOLO model (downloads on first run)
-    # Using yolo11s (small) for better accuracy in challenging conditions
-    model = YOLO("yolo11s.pt")
+    model = get_model()
 
     # Extract specified frame
     cap = cv2.VideoCapture(video_path)
@@ -52,18 +112,20 @@ def detect_players(video_path: str, frame_index: int = 0):
         raise ValueError(f"Could not read frame {frame_index} from {video_path}")
 
     # Run detection
-    results = model(frame, verbose=False)
+    results = model(frame, verbose=False, **INFERENCE_KWARGS)
+
+    # Copy the frame's boxes to the host once rather than per box
+    boxes = results[0].boxes
+    xyxy = boxes.xyxy.cpu().numpy()  # [x1, y1, x2, y2] per box
+    confs = boxes.conf.cpu().numpy()
+    classes = boxes.cls.cpu().numpy().astype(np.int32)
 
     # Filter for persons (class 0 in COCO dataset)
-    detections = []
-    for box in results[0].boxes:
-        if int(box.cls[0]) == 0:  # Person class
-            detections.append(
-                {
-                    "bbox": box.xyxy[0].cpu().numpy().tolist(),  # [x1, y1, x2, y2]
-                    "confidence": float(box.conf[0]),
-                }
-            )
+    detections = [
+        {"bbox": bbox.tolist(), "confidence": float(conf)}
+        for bbox, conf, cls in zip(xyxy, confs, classes)
+        if cls == 0  # Person class
+    ]
 
     print(f"Detected {len(detections)} players")
     for i, det in enumerate(detections):
@@ -119,32 +181,200 @@ def find_closest_box(boxes, target_bbox):
         target_bbox: Reference box [x1,y1,x2,y2]
 
     Returns:
-        Closest box or None if no boxes
+        (index, closest box), or (None, None) if no boxes
     """
     if len(boxes) == 0:
-        return None
+        return None, None
 
-    # Calculate target center
+    boxes = np.asarray(boxes, dtype=np.float32)
+    centers = (boxes[:, :2] + boxes[:, 2:4]) * 0.5
     target_center = np.array(
-        [(target_bbox[0] + target_bbox[2]) / 2, (target_bbox[1] + target_bbox[3]) / 2]
+        [
+            (target_bbox[0] + target_bbox[2]) * 0.5,
+            (target_bbox[1] + target_bbox[3]) * 0.5,
+        ],
+        dtype=np.float32,
+    )
+
+    # Squared distance ranks the same as the Euclidean one
+    dist_sq = ((centers - target_center) ** 2).sum(axis=1)
+    best_idx = int(dist_sq.argmin())
+    return best_idx, boxes[best_idx]
+
+
+def compute_overlay_coords(boxes_xyxy, prev_sx, prev_sy, alpha):
+    """
+    Compute the smoothed indicator dot position for a batch of tracked boxes.
+
+    The dot sits 20px above the top-center of each box and is smoothed with an
+    exponential moving average. Rows of NaN (target lost) keep the previous
+    position. JIT-compiled with Numba when it is installed.
+
+    Args:
+        boxes_xyxy: (N, 4) array of boxes [x1, y1, x2, y2], NaN rows if lost
+        prev_sx, prev_sy: Smoothed position after the previous batch (NaN if none yet)
+        alpha: Smoothing factor (0 = no smoothing, 1 = no memory)
+
+    Returns:
+        (N, 2) array of smoothed [x, y] positions
+    """
+    n = boxes_xyxy.shape[0]
+    dots = np.empty((n, 2))
+    sx = prev_sx
+    sy = prev_sy
+    for i in range(n):
+        if not np.isnan(boxes_xyxy[i, 0]):
+            # Head position: top-center of the bbox (integer pixels), 20px above
+            head_x = float((int(boxes_xyxy[i, 0]) + int(boxes_xyxy[i, 2])) // 2)
+            head_y = float(int(boxes_xyxy[i, 1]) - 20)
+            if np.isnan(sx):
+                sx = head_x
+                sy = head_y
+            else:
+                sx = alpha * head_x + (1 - alpha) * sx
+                sy = alpha * head_y + (1 - alpha) * sy
+        dots[i, 0] = sx
+        dots[i, 1] = sy
+    return dots
+
+
+if njit is not None:
+    compute_overlay_coords = njit(cache=True)(compute_overlay_coords)
+
+
+def open_video(video_path: str):
+    """
+    Open a video for decoding, using a hardware decoder (NVDEC, VAAPI, ...) if available.
+
+    OpenCV falls back to software decoding when no hardware decoder is usable.
+    """
+    return cv2.VideoCapture(
+        video_path,
+        cv2.CAP_FFMPEG,
+        [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
     )
 
-    # Find box with minimum distance to target
-    min_dist = float("inf")
-    best_box = None
 
-    for box in boxes:
-        box_center = np.array([(box[0] + box[2]) / 2, (box[1] + box[3]) / 2])
-        dist = np.linalg.norm(box_center - target_center)
+def iter_frame_batches(cap, batch_size: int = FRAME_BATCH_SIZE, stride: int = 1):
+    """
+    Decode frames from an open capture and yield them in lists of up to batch_size.
+
+    Args:
+        cap: Opened cv2.VideoCapture
+        batch_size: Frames per batch
+        stride: Keep every stride-th frame; the others are only grabbed, never
+            converted to BGR images
+
+    Yields:
+        List of BGR frames
+    """
+    batch = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        batch.append(frame)
+        for _ in range(stride - 1):
+            if not cap.grab():
+                break
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def pick_h264_encoder() -> str:
+    """Use NVENC on CUDA machines where a short test encode with it works, else libx264."""
+    if torch.cuda.is_available():
+        # Being listed by -encoders doesn't mean the driver and GPU can run it
+        probe = subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-f",
+                "lavfi",
+                "-i",
+                "color=size=256x256:duration=0.1",
+                "-c:v",
+                "h264_nvenc",
+                "-f",
+                "null",
+                "-",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        if probe.returncode == 0:
+            return "h264_nvenc"
+    return "libx264"
+
+
+def start_encoder(output_path: str, width: int, height: int, fps: int, encoder: str, log):
+    """
+    Start an ffmpeg process that encodes raw BGR frames from stdin to H.264.
 
-        if dist < min_dist:
-            min_dist = dist
-            best_box = box
+    Args:
+        output_path: Output mp4 path
+        width: Frame width
+        height: Frame height
+        fps: Output frame rate
+        encoder: ffmpeg H.264 encoder name (h264_nvenc or libx264)
+        log: Binary file receiving ffmpeg's stderr; a pipe nobody reads
+            would fill up and stall the encode
+
+    Returns:
+        subprocess.Popen with a writable stdin
+    """
+    if encoder == "libx264":
+        quality = ["-preset", "ultrafast", "-crf", "28"]
+    else:
+        quality = ["-cq", "28"]
+    return subprocess.Popen(
+        [
+            "ffmpeg",
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "bgr24",
+            "-s",
+            f"{width}x{height}",
+            "-r",
+            str(fps),
+            "-i",
+            "-",
+            "-c:v",
+            encoder,
+            *quality,
+            "-pix_fmt",
+            "yuv420p",
+            output_path,
+        ],
+        stdin=subprocess.PIPE,
+        stderr=log,
+    )
 
-    return best_box
 
+def finish_encoder(encoder, log) -> None:
+    """Close the encoder's stdin, wait for it to exit, and raise with its stderr if it failed."""
+    try:
+        encoder.stdin.close()
+    except BrokenPipeError:
+        pass  # ffmpeg already exited; its return code and log say why
+    encoder.wait()
+    if encoder.returncode != 0:
+        log.seek(0)
+        stderr = log.read().decode(errors="replace")
+        raise RuntimeError(f"FFmpeg encoding failed: {stderr}")
 
-def track_player(video_path: str, target_bbox: list, output_path: str):
+
+def track_player(video_path: str, target_bbox: list, output_path: str, encoder_name: str | None = None):
     """
     Track player from initial bbox through video.
     Renders dot above head in 720p @ 30fps preview.
@@ -153,6 +383,8 @@ def track_player(video_path: str, target_bbox: list, output_path: str):
         video_path: Source video
         target_bbox: Initial bounding box [x1, y1, x2, y2]
         output_path: Output preview video path
+        encoder_name: H.264 encoder to use; picked by pick_h264_encoder if None.
+            If an NVENC encode fails, tracking runs again with libx264.
 
     Returns:
         Performance metrics dict
@@ -162,17 +394,15 @@ def track_player(video_path: str, target_bbox: list, output_path: str):
 
     start_time = time.time()
 
-    # Load YOLO model
-    # Using yolo11s (small) for better accuracy in challenging conditions
-    model = YOLO("yolo11s.pt")
+    # Reuse the model loaded for detection
+    model = get_model()
 
     # Get video properties
-    cap = cv2.VideoCapture(video_path)
+    cap = open_video(video_path)
     fps = int(cap.get(cv2.CAP_PROP_FPS))
     width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    cap.release()
 
     print(f"Video: {width}x{height} @ {fps}fps, {total_frames} frames")
 
@@ -181,165 +411,159 @@ def track_player(video_path: str, target_bbox: list, output_path: str):
     out_height = 720
     out_fps = 30
 
-    # Temporary output (raw frames)
-    temp_output = output_path.replace(".mp4", "_temp.avi")
-    fourcc = cv2.VideoWriter_fourcc(*"XVID")
-    out = cv2.VideoWriter(temp_output, fourcc, out_fps, (out_width, out_height))
+    cv2.ocl.setUseOpenCL(USE_OPENCL)
+
+    # Frames are piped straight into one H.264 encode (no intermediate file)
+    if encoder_name is None:
+        encoder_name = pick_h264_encoder()
+    encoder_log = tempfile.TemporaryFile()  # noqa: SIM115  (closed after finish_encoder)
+    encoder = start_encoder(output_path, out_width, out_height, out_fps, encoder_name, encoder_log)
+    encoder_broken = False
 
     # Run tracking with BoT-SORT
     print("Running YOLO tracking (this may take a while)...")
     tracking_start = time.time()
 
     frame_idx = 0
+    processed_frames = 0
     tracked_frames = 0
     frame_skip = max(1, fps // out_fps)  # Sample frames for output fps
     target_track_id = None  # Will be set on first frame
 
-    # Smoothing for dot position (reduces flickering)
-    smoothed_x = None
-    smoothed_y = None
+    # Smoothing for dot position (reduces flickering); NaN until the first tracked frame
+    smoothed_x = np.nan
+    smoothed_y = np.nan
     smoothing_factor = 0.3  # 0 = no smoothing, 1 = no memory
 
-    # Track through video
-    for result in model.track(
-        source=video_path,
-        stream=True,
-        tracker="botsort.yaml",  # BoT-SORT tracker config
-        persist=True,
-        verbose=False,
-        conf=0.2,  # Lower confidence threshold for challenging backgrounds
-    ):
-        frame = result.orig_img.copy()
-
-        # Find tracked box using YOLO tracking IDs
-        best_box = None
-        if (
-            result.boxes is not None
-            and len(result.boxes) > 0
-            and result.boxes.id is not None
-        ):
+    # Track through video: only the frames kept for the output fps are converted and
+    # run through YOLO, in batches; ultralytics feeds each batch's results through
+    # the persisted tracker in frame order
+    for batch in iter_frame_batches(cap, stride=frame_skip):
+        batch_results = model.track(
+            batch,
+            tracker="botsort.yaml",  # BoT-SORT tracker config
+            persist=True,
+            verbose=False,
+            conf=0.2,  # Lower confidence threshold for challenging backgrounds
+            **INFERENCE_KWARGS,
+        )
+
+        # Find the tracked box in each frame using YOLO tracking IDs (NaN row if lost)
+        batch_boxes = np.full((len(batch_results), 4), np.nan, dtype=np.float32)
+        for i, result in enumerate(batch_results):
+            if (
+                result.boxes is None
+                or len(result.boxes) == 0
+                or result.boxes.id is None
+            ):
+                continue
+
+            # One device-to-host copy per frame instead of one per box
+            xyxy = result.boxes.xyxy.cpu().numpy()
+            classes = result.boxes.cls.cpu().numpy().astype(np.int32)
+            ids = result.boxes.id.cpu().numpy().astype(np.int64)
+
+            # Person boxes (class 0) and their tracking IDs as parallel arrays
+            person_mask = classes == 0
+            person_boxes = xyxy[person_mask]
+            person_ids = ids[person_mask]
+
             # On first frame, identify which tracking ID corresponds to our target player
-            if target_track_id is None and frame_idx == 0:
-                # Find person bbox closest to target on first frame
-                person_boxes_with_ids = []
-                for box in result.boxes:
-                    if int(box.cls[0]) == 0:  # Person class
-                        person_boxes_with_ids.append(
-                            {
-                                "bbox": box.xyxy[0].cpu().numpy(),
-                                "track_id": int(box.id[0]),
-                            }
-                        )
-
-                if len(person_boxes_with_ids) > 0:
-                    # Find closest to initial target
-                    person_boxes = [p["bbox"] for p in person_boxes_with_ids]
-                    closest_bbox = find_closest_box(person_boxes, target_bbox)
-
-                    # Get tracking ID for this bbox
-                    for p in person_boxes_with_ids:
-                        if np.allclose(p["bbox"], closest_bbox):
-                            target_track_id = p["track_id"]
-                            best_box = closest_bbox
-                            print(f"Locked onto tracking ID: {target_track_id}")
-                            break
+            if target_track_id is None and processed_frames + i == 0:
+                if len(person_boxes) > 0:
+                    # Find closest to initial target; its index gives the tracking ID
+                    best_idx, batch_boxes[i] = find_closest_box(person_boxes, target_bbox)
+                    target_track_id = int(person_ids[best_idx])
+                    print(f"Locked onto tracking ID: {target_track_id}")
 
             # On subsequent frames, follow the same tracking ID
             elif target_track_id is not None:
-                for box in result.boxes:
-                    if int(box.cls[0]) == 0 and int(box.id[0]) == target_track_id:
-                        best_box = box.xyxy[0].cpu().numpy()
-                        break
-
-        # Draw indicator if tracking successful
-        if best_box is not None:
-            x1, y1, x2, y2 = map(int, best_box)
-
-            # Draw full bounding box for debugging
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 3)
-
-            # Draw tracking ID label
-            label = f"ID: {target_track_id}"
-            cv2.putText(
-                frame, label, (x1, y1 - 10),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2
-            )
-
-            # Calculate head position (top-center of bbox, 20px above)
-            head_x = (x1 + x2) // 2
-            head_y = y1 - 20
-
-            # Apply exponential moving average smoothing to reduce flickering
-            if smoothed_x is None:
-                smoothed_x = head_x
-                smoothed_y = head_y
-            else:
-                smoothed_x = (
-                    smoothing_factor * head_x + (1 - smoothing_factor) * smoothed_x
+                matches = np.flatnonzero(person_ids == target_track_id)
+                if len(matches) > 0:
+                    batch_boxes[i] = person_boxes[matches[0]]
+
+        # Smoothed dot positions for the whole batch in one call
+        dots = compute_overlay_coords(batch_boxes, smoothed_x, smoothed_y, smoothing_factor)
+        smoothed_x, smoothed_y = dots[-1]
+
+        for result, best_box, dot in zip(batch_results, batch_boxes, dots):
+            # Write frame to output (frames were already sampled for the output fps).
+            # With OpenCL the overlays and resize run on a UMat and only the 720p
+            # result is downloaded for the encoder; orig_img is the decoded frame
+            canvas = cv2.UMat(result.orig_img) if USE_OPENCL else result.orig_img
+
+            # Draw indicator if tracking successful
+            if not np.isnan(best_box[0]):
+                x1, y1, x2, y2 = map(int, best_box)
+
+                # Draw full bounding box for debugging
+                cv2.rectangle(canvas, (x1, y1), (x2, y2), (0, 255, 0), 3)
+
+                # Draw tracking ID label
+                label = f"ID: {target_track_id}"
+                cv2.putText(
+                    canvas, label, (x1, y1 - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2
                 )
-                smoothed_y = (
-                    smoothing_factor * head_y + (1 - smoothing_factor) * smoothed_y
-                )
-
-            # Draw green dot (8px radius) at smoothed position
-            cv2.circle(frame, (int(smoothed_x), int(smoothed_y)), 12, (0, 255, 0), -1)
-            # Draw black outline for visibility
-            cv2.circle(frame, (int(smoothed_x), int(smoothed_y)), 12, (0, 0, 0), 2)
 
-            tracked_frames += 1
+                # Draw green dot (8px radius) at smoothed position
+                center = (int(dot[0]), int(dot[1]))
+                cv2.circle(canvas, center, 12, (0, 255, 0), -1)
+                # Draw black outline for visibility
+                cv2.circle(canvas, center, 12, (0, 0, 0), 2)
+
+                tracked_frames += 1
+
+            frame_resized = cv2.resize(canvas, (out_width, out_height))
+            if USE_OPENCL:
+                frame_resized = frame_resized.get()
+            try:
+                encoder.stdin.write(frame_resized.tobytes())
+            except BrokenPipeError:
+                # ffmpeg exited early; finish_encoder reports its stderr
+                encoder_broken = True
+                break
 
-        # Write frame to output (with fps conversion)
-        if frame_idx % frame_skip == 0:
-            frame_resized = cv2.resize(frame, (out_width, out_height))
-            out.write(frame_resized)
+            frame_idx += frame_skip
+            processed_frames += 1
 
-        frame_idx += 1
+            # Progress indicator
+            if processed_frames % 30 == 0:
+                progress = min(frame_idx / total_frames, 1.0) * 100
+                print(f"  Progress: {progress:.1f}% ({frame_idx}/{total_frames} frames)")
 
-        # Progress indicator
-        if frame_idx % 30 == 0:
-            progress = (frame_idx / total_frames) * 100
-            print(f"  Progress: {progress:.1f}% ({frame_idx}/{total_frames} frames)")
+        if encoder_broken:
+            break
 
-    out.release()
+    cap.release()
 
     tracking_time = time.time() - tracking_start
-    print(f"Tracking complete: {tracking_time:.1f}s")
-    print(
-        f"Tracked {tracked_frames}/{total_frames} frames ({tracked_frames / total_frames * 100:.1f}%)"
-    )
 
-    # Re-encode with FFmpeg for better quality/compatibility
-    print("\nRe-encoding with FFmpeg...")
+    # Encoding ran alongside tracking; wait for ffmpeg to flush the remaining frames
+    print("\nFinishing FFmpeg encode...")
     encode_start = time.time()
 
-    result = subprocess.run(
-        [
-            "ffmpeg",
-            "-y",
-            "-i",
-            temp_output,
-            "-c:v",
-            "libx264",
-            "-preset",
-            "ultrafast",
-            "-crf",
-            "28",
-            "-pix_fmt",
-            "yuv420p",
-            output_path,
-        ],
-        capture_output=True,
-        text=True,
-    )
+    try:
+        finish_encoder(encoder, encoder_log)
+    except RuntimeError as e:
+        if encoder_name == "libx264":
+            raise
+        print(f"{e}\n{encoder_name} failed; tracking again with libx264")
+        # The rerun needs a fresh tracker, not the one left mid-video by this run
+        model.predictor = None
+        model.reset_callbacks()
+        return track_player(video_path, target_bbox, output_path, encoder_name="libx264")
+    finally:
+        encoder_log.close()
 
-    if result.returncode != 0:
-        print("FFmpeg error:", result.stderr)
-        raise RuntimeError("FFmpeg encoding failed")
+    encode_time = time.time() - encode_start
 
-    # Clean up temp file
-    Path(temp_output).unlink()
+    print(f"Tracking complete: {tracking_time:.1f}s")
+    print(
+        f"Tracked {tracked_frames}/{processed_frames} processed frames "
+        f"({tracked_frames / processed_frames * 100:.1f}%)"
+    )
 
-    encode_time = time.time() - encode_start
     total_time = time.time() - start_time
 
     print(f"Encoding complete: {encode_time:.1f}s")
@@ -351,8 +575,9 @@ def track_player(video_path: str, target_bbox: list, output_path: str):
 
     return {
         "total_frames": total_frames,
+        "processed_frames": processed_frames,
         "tracked_frames": tracked_frames,
-        "tracking_success_rate": tracked_frames / total_frames,
+        "tracking_success_rate": tracked_frames / processed_frames,
         "video_duration_sec": video_duration,
         "tracking_time_sec": tracking_time,
         "encoding_time_sec": encode_time,
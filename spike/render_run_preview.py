@@ -10,18 +10,34 @@ from pathlib import Path
 from typing import Optional
 
 import cv2
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json parser
+    orjson = None
 
 
 def load_run(run_path: Path):
-    data = json.loads(run_path.read_text())
-    return data
+    # Parse the raw bytes directly (no str decode); frame logs can be several MB
+    raw = run_path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def open_video(video_path: Path):
+    """Open a video for decoding, using a hardware decoder if available (else software)."""
+    return cv2.VideoCapture(
+        str(video_path), cv2.CAP_FFMPEG, [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+    )
 
 
 def render(run_json: Path, video_path: Path, output_path: Path, max_frames: Optional[int], show_bbox: bool):
     run = load_run(run_json)
     frame_log = run["frame_log"]
 
-    cap = cv2.VideoCapture(str(video_path))
+    cap = open_video(video_path)
     fps = cap.get(cv2.CAP_PROP_FPS) or 30
     width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -29,9 +45,11 @@ def render(run_json: Path, video_path: Path, output_path: Path, max_frames: Opti
     output_path.parent.mkdir(parents=True, exist_ok=True)
     writer = cv2.VideoWriter(
         str(output_path),
+        cv2.CAP_FFMPEG,
         cv2.VideoWriter_fourcc(*"mp4v"),
         fps,
         (width, height),
+        [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
     )
 
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
@@ -39,22 +57,35 @@ def render(run_json: Path, video_path: Path, output_path: Path, max_frames: Opti
     if max_frames is not None:
         limit = min(limit, max_frames)
 
+    # Unpack the frame log into per-frame arrays once, instead of dict lookups per frame
+    logs = frame_log[:limit]
+    tracked = np.fromiter((bool(log.get("tracked") and log.get("bbox")) for log in logs), dtype=bool, count=len(logs))
+    bboxes = np.array([log.get("bbox") or (0, 0, 0, 0) for log in logs], dtype=np.float64).reshape(-1, 4)
+    corners = bboxes.astype(np.int64).tolist()
+    centers = ((bboxes[:, :2] + bboxes[:, 2:]) / 2).astype(np.int64).tolist()
+    track_ids = [log.get("track_id") for log in logs]
+    font = cv2.FONT_HERSHEY_SIMPLEX
+
+    # The id label only changes when the track id does
+    label = None
+    label_id = object()
+
     for idx in range(limit):
         ret, frame = cap.read()
         if not ret:
             break
-        log = frame_log[idx]
-        if log.get("tracked") and log.get("bbox"):
-            x1, y1, x2, y2 = log["bbox"]
-            cx = int((x1 + x2) / 2)
-            cy = int((y1 + y2) / 2)
+        if tracked[idx]:
+            cx, cy = centers[idx]
             if show_bbox:
-                cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), (0, 255, 0), 2)
+                x1, y1, x2, y2 = corners[idx]
+                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
             cv2.circle(frame, (cx, cy), 12, (0, 0, 255), thickness=-1)
-            label = f"id={log.get('track_id')}"
-            cv2.putText(frame, label, (cx + 10, cy - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            if track_ids[idx] != label_id:
+                label_id = track_ids[idx]
+                label = f"id={label_id}"
+            cv2.putText(frame, label, (cx + 10, cy - 10), font, 0.6, (255, 255, 255), 2)
         else:
-            cv2.putText(frame, "NO TRACK", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 255), 2)
+            cv2.putText(frame, "NO TRACK", (20, 40), font, 1.0, (0, 0, 255), 2)
         writer.write(frame)
         if idx % 100 == 0 and idx > 0:
             print(f"Rendered {idx}/{limit} frames...")
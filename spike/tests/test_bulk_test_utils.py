@@ -1,6 +1,10 @@
+import dataclasses
+import json
+import threading
 from pathlib import Path
 import pytest
 import numpy as np
+import torch
 
 import yaml
 
@@ -8,7 +12,16 @@ from spike import bulk_test
 import numpy as np
 
 
-def test_build_tracker_config_overrides(monkeypatch, tmp_path):
+@pytest.fixture
+def fresh_tracker_cfg_cache():
+    bulk_test._load_base_tracker_cfg.cache_clear()
+    bulk_test._write_tracker_config.cache_clear()
+    yield
+    bulk_test._load_base_tracker_cfg.cache_clear()
+    bulk_test._write_tracker_config.cache_clear()
+
+
+def test_build_tracker_config_overrides(monkeypatch, tmp_path, fresh_tracker_cfg_cache):
     base_cfg = {
         "track_buffer": 25,
         "with_reid": True,
@@ -28,7 +41,21 @@ def test_build_tracker_config_overrides(monkeypatch, tmp_path):
     assert cfg["some_other_key"] == 123
 
 
-def test_build_tracker_config_none_override_leaves_default(monkeypatch, tmp_path):
+def test_build_tracker_config_reuses_file_per_distinct_config(monkeypatch, tmp_path, fresh_tracker_cfg_cache):
+    base_path = tmp_path / "base.yaml"
+    base_path.write_text(yaml.safe_dump({"track_buffer": 25}))
+    monkeypatch.setattr(bulk_test, "get_tracker_cfg_path", lambda tracker: base_path)
+
+    first = bulk_test.build_tracker_config("bytetrack", {"track_buffer": 50})
+    again = bulk_test.build_tracker_config("bytetrack", {"track_buffer": 50})
+    other = bulk_test.build_tracker_config("bytetrack", {"track_buffer": 60})
+
+    assert first == again
+    assert other != first
+    assert yaml.safe_load(Path(other).read_text())["track_buffer"] == 60
+
+
+def test_build_tracker_config_none_override_leaves_default(monkeypatch, tmp_path, fresh_tracker_cfg_cache):
     base_cfg = {
         "track_buffer": 25,
         "track_low_thresh": 0.05,
@@ -46,6 +73,50 @@ def test_build_tracker_config_none_override_leaves_default(monkeypatch, tmp_path
     assert cfg["track_low_thresh"] == 0.05
 
 
+def test_find_closest_box_picks_nearest_center():
+    boxes = np.array([
+        [0, 0, 10, 10],
+        [100, 100, 120, 140],
+        [40, 40, 60, 60],
+    ])
+    idx, closest = bulk_test.find_closest_box(boxes, [45, 45, 65, 65])
+
+    assert idx == 2
+    assert closest.tolist() == [40, 40, 60, 60]
+    assert bulk_test.find_closest_box(np.empty((0, 4)), [0, 0, 1, 1]) == (None, None)
+
+
+def test_model_weights_path_uses_engine_only_with_tensorrt(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(bulk_test.torch.cuda, "is_available", lambda: True)
+    (tmp_path / "yolo11n.engine").touch()
+
+    # An engine left by an earlier --tensorrt sweep is ignored by plain runs
+    assert bulk_test.model_weights_path("yolo11n") == "yolo11n.pt"
+    assert bulk_test.model_weights_path("yolo11n", tensorrt=True) == "yolo11n.engine"
+
+
+def test_model_weights_path_prefers_int8_export_when_requested(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(bulk_test.torch.cuda, "is_available", lambda: False)
+
+    assert bulk_test.model_weights_path("yolo11n", int8=True) == "yolo11n.pt"
+
+    (tmp_path / "yolo11n_int8_openvino_model").mkdir()
+    assert bulk_test.model_weights_path("yolo11n", int8=True) == "yolo11n_int8_openvino_model"
+    assert bulk_test.model_weights_path("yolo11n") == "yolo11n.pt"
+
+
+def test_worker_cores_splits_allowed_cpus_into_blocks(monkeypatch):
+    monkeypatch.setattr(bulk_test.os, "sched_getaffinity", lambda _pid: {2, 3, 4, 5, 6, 7, 8}, raising=False)
+
+    assert bulk_test.worker_cores(0, 3) == [2, 3, 4]
+    assert bulk_test.worker_cores(1, 3) == [5, 6, 7]
+    # More workers than whole blocks: wrap around instead of running past the allowed set
+    assert bulk_test.worker_cores(2, 3) == [2, 3, 4]
+    assert bulk_test.worker_cores(0, 16) == [2, 3, 4, 5, 6, 7, 8]
+
+
 def test_summarize_frame_log_basic():
     fps = 10
     frame_log = [
@@ -89,6 +160,15 @@ def test_summarize_frame_log_zero_fps_raises():
         bulk_test.summarize_frame_log([], 0)
 
 
+def test_tracked_streak_loop_matches_numpy_fallback():
+    rng = np.random.default_rng(0)
+    masks = [np.array([], dtype=bool), np.ones(5, dtype=bool), np.zeros(5, dtype=bool)]
+    masks += [rng.random(50) > 0.3 for _ in range(20)]
+
+    for tracked in masks:
+        assert bulk_test._tracked_streaks_loop(tracked) == bulk_test._tracked_streaks_numpy(tracked)
+
+
 def test_ensure_jsonable_converts_numpy_and_path(tmp_path):
     data = {
         "a": np.float32(1.5),
@@ -105,7 +185,110 @@ def test_ensure_jsonable_converts_numpy_and_path(tmp_path):
     assert cleaned["d"][1] == [1.0, 2.0]
 
 
-def test_run_single_test_tracks_movement(monkeypatch, tmp_path):
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_json_handles_numpy_and_path(monkeypatch, tmp_path, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(bulk_test, "orjson", None)
+    elif bulk_test.orjson is None:
+        pytest.skip("orjson not installed")
+
+    data = {
+        "a": np.float32(1.5),
+        "b": np.bool_(True),
+        "c": Path(tmp_path),
+        "d": [np.int64(3), np.array([1.0, 2.0])],
+    }
+    decoded = json.loads(bulk_test.dumps_json(data, indent=True))
+
+    assert decoded == {"a": 1.5, "b": True, "c": str(tmp_path), "d": [3, [1.0, 2.0]]}
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_save_results_writes_runs_and_archive(monkeypatch, tmp_path, compact):
+    monkeypatch.setattr(bulk_test, "generate_summary_report", lambda *_args: None)
+    frame = bulk_test.TrackingFrame(frame=0, time_sec=0.0, tracked=True, bbox=[0.0, 0.0, 1.0, 1.0],
+                                    confidence=np.float32(0.5), track_id=1)
+    fields = {name: 0 for name in bulk_test.TestResults.__dataclass_fields__}
+    results = [
+        bulk_test.TestResults(**{**fields, "run_id": f"run{i}", "tracker_params": {}, "frame_log": [frame]})
+        for i in range(3)
+    ]
+
+    bulk_test.save_results(results, tmp_path, compact=compact)
+
+    lines = (tmp_path / "bulk_test_data.jsonl").read_text().splitlines()
+    assert [json.loads(line)["run_id"] for line in lines] == ["run0", "run1", "run2"]
+    assert json.loads(lines[0])["frame_log"][0]["confidence"] == 0.5
+    assert (tmp_path / "bulk_test_results.csv").exists()
+    if compact:
+        assert not (tmp_path / "runs").exists()
+    else:
+        run_files = sorted(p.name for p in (tmp_path / "runs").glob("*.json"))
+        assert run_files == ["run0.json", "run1.json", "run2.json"]
+
+
+def test_track_batches_skips_similar_frames(monkeypatch):
+    still = np.zeros((48, 64, 3), dtype=np.uint8)
+    moved = np.full((48, 64, 3), 200, dtype=np.uint8)
+    monkeypatch.setattr(bulk_test, "iter_frame_batches", lambda *_args: iter([[still, still.copy(), moved]]))
+
+    class RecordingModel:
+        def __init__(self):
+            self.sources = []
+
+        def track(self, source, **__):
+            self.sources.append(source)
+            return [f"result{i}" for i in range(len(source))]
+
+    model = RecordingModel()
+    assert list(bulk_test.track_batches(model, "vid.mp4", "cfg.yaml", 0.2)) == ["result0", "result1", "result2"]
+
+    model = RecordingModel()
+    results = list(bulk_test.track_batches(model, "vid.mp4", "cfg.yaml", 0.2, skip_similar=True))
+    assert results == ["result0", None, "result1"]
+    assert len(model.sources[0]) == 2
+
+
+def test_iter_detections_replays_cached_detections(monkeypatch, tmp_path):
+    frames = [np.zeros((48, 64, 3), dtype=np.uint8) for _ in range(3)]
+    monkeypatch.setattr(bulk_test, "iter_frame_batches", lambda *_args: iter([frames[:2], frames[2:]]))
+
+    class DummyBoxes:
+        def __init__(self, data):
+            self.data = torch.as_tensor(data)
+
+    class DummyResult:
+        def __init__(self, n):
+            self.boxes = DummyBoxes(np.full((n, 6), n, dtype=np.float32))
+
+    class CountingModel:
+        def __init__(self):
+            self.frames_predicted = 0
+
+        def predict(self, source, **__):
+            self.frames_predicted += len(source)
+            return [DummyResult(len(source) + i) for i in range(len(source))]
+
+    cache_path = tmp_path / "cache" / "dets.npz"
+    model = CountingModel()
+    live = [dets for _, dets in bulk_test.iter_detections(model, "vid.mp4", 0.2, cache_path)]
+    assert cache_path.exists()
+
+    replayed = [dets for _, dets in bulk_test.iter_detections(model, "vid.mp4", 0.2, cache_path)]
+    assert model.frames_predicted == 3
+    assert [len(d) for d in replayed] == [2, 3, 1]
+    for expected, actual in zip(live, replayed):
+        np.testing.assert_array_equal(expected, actual)
+
+
+def test_can_replay_detections_requires_no_detector_reid():
+    assert bulk_test.can_replay_detections({"tracker_type": "bytetrack"})
+    assert bulk_test.can_replay_detections({"tracker_type": "botsort", "with_reid": False})
+    assert not bulk_test.can_replay_detections({"tracker_type": "botsort", "with_reid": True})
+
+
+@pytest.mark.parametrize("leading_empty_frames", [0, 2])
+def test_run_single_test_tracks_movement(monkeypatch, tmp_path, leading_empty_frames):
     """Ensure tracking uses per-frame boxes (not frozen to first frame)."""
 
     class DummyTensor:
@@ -137,7 +320,10 @@ def test_run_single_test_tracks_movement(monkeypatch, tmp_path):
     class DummyBoxes(list):
         def __init__(self, boxes):
             super().__init__(boxes)
-            self.id = np.array([b.id[0] for b in boxes])
+            self.id = DummyTensor([b.id.numpy()[0] for b in boxes])
+            self.cls = DummyTensor([b.cls.numpy()[0] for b in boxes])
+            self.conf = DummyTensor([b.conf.numpy()[0] for b in boxes])
+            self.xyxy = DummyTensor([b.xyxy.numpy()[0] for b in boxes])
 
     class DummyResult:
         def __init__(self, boxes):
@@ -145,24 +331,34 @@ def test_run_single_test_tracks_movement(monkeypatch, tmp_path):
 
     class DummyModel:
         def __init__(self, *_args, **_kwargs):
+            self.predictor = None
+
+        def reset_callbacks(self):
             pass
 
-        def track(self, *_, **__):
-            # Two frames: same track id, different centers
-            return iter([
+        def track(self, source, **__):
+            # Frames without people first, then two frames: same track id, different centers
+            assert isinstance(source, list)
+            return [DummyResult([]) for _ in range(leading_empty_frames)] + [
                 DummyResult([DummyBox([0, 0, 10, 10], track_id=1)]),
                 DummyResult([DummyBox([5, 0, 15, 10], track_id=1)]),
-            ])
+            ][:len(source)]
 
     class DummyCap:
         def __init__(self, *_args, **_kwargs):
-            pass
+            self.frames_left = 2 + leading_empty_frames
+
+        def read(self, image=None):
+            if self.frames_left == 0:
+                return False, None
+            self.frames_left -= 1
+            return True, np.zeros((1080, 1920, 3), dtype=np.uint8)
 
         def get(self, prop):
             if prop == bulk_test.cv2.CAP_PROP_FPS:
                 return 30
             if prop == bulk_test.cv2.CAP_PROP_FRAME_COUNT:
-                return 2
+                return 2 + leading_empty_frames
             if prop == bulk_test.cv2.CAP_PROP_FRAME_WIDTH:
                 return 1920
             if prop == bulk_test.cv2.CAP_PROP_FRAME_HEIGHT:
@@ -174,9 +370,14 @@ def test_run_single_test_tracks_movement(monkeypatch, tmp_path):
 
     # Patch dependencies
     monkeypatch.setattr(bulk_test, "YOLO", DummyModel)
+    monkeypatch.setattr(bulk_test, "_MODELS", {})
     monkeypatch.setattr(bulk_test.cv2, "VideoCapture", DummyCap)
-    monkeypatch.setattr(bulk_test, "detect_players",
-                        lambda *_args, **_kwargs: [{"bbox": [0, 0, 10, 10], "confidence": 0.9}])
+
+    # Ranked by the default-conf detection main() counted players with; the
+    # tracker's box is offset slightly from it
+    monkeypatch.setattr(
+        bulk_test, "detect_players", lambda *_: [{'bbox': [1, 1, 11, 11], 'confidence': 0.8}]
+    )
 
     tracker_cfg = tmp_path / "tracker.yaml"
     tracker_cfg.write_text("track_buffer: 25\n")
@@ -194,8 +395,44 @@ def test_run_single_test_tracks_movement(monkeypatch, tmp_path):
 
     results = bulk_test.run_single_test(config)
 
+    # Frames before the tracker reports any IDs are untracked rather than an error
     assert results.tracked_frames == 2
-    assert results.total_frames == 2
+    assert results.total_frames == 2 + leading_empty_frames
     # Movement occurred between frames
     assert results.max_center_drift_px > 0.1
     assert results.center_drift_ratio > 0.0
+    assert results.detection_count_first_frame == 1
+    assert results.target_initial_confidence == pytest.approx(0.8)
+
+
+def make_results(run_id):
+    defaults = {str: "x", float: 0.0, int: 0, bool: False}
+    values = {f.name: defaults.get(f.type) for f in dataclasses.fields(bulk_test.TestResults)}
+    return bulk_test.TestResults(**{**values, "run_id": run_id, "tracker_params": {}, "frame_log": []})
+
+
+def test_results_writer_bounds_pending_writes(monkeypatch, tmp_path):
+    monkeypatch.setattr(bulk_test, "MAX_PENDING_WRITES", 1)
+    monkeypatch.setattr(bulk_test, "generate_summary_report", lambda *_: None)
+    release = threading.Event()
+    write_run_file = bulk_test.write_run_file
+
+    def slow_write_run_file(*args):
+        release.wait(timeout=5)
+        write_run_file(*args)
+
+    monkeypatch.setattr(bulk_test, "write_run_file", slow_write_run_file)
+
+    with bulk_test.ResultsWriter(tmp_path) as writer:
+        writer.write(make_results("r1"))
+        second = threading.Thread(target=writer.write, args=(make_results("r2"),))
+        second.start()
+        # The first run's JSON is still being written, so the second write waits
+        second.join(timeout=0.2)
+        assert second.is_alive()
+        release.set()
+        second.join(timeout=5)
+        assert not second.is_alive()
+
+    assert sorted(p.name for p in (tmp_path / "runs").iterdir()) == ["r1.json", "r2.json"]
+    assert len((tmp_path / "bulk_test_data.jsonl").read_text().splitlines()) == 2
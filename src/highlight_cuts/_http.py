@@ -0,0 +1,20 @@
+"""
+Shared HTTP session for Google Sheets requests.
+
+Reusing one session keeps connections to docs.google.com alive between the
+CSV download and the title lookup, instead of paying a new TCP and TLS
+handshake for every request.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Retries cover dropped connections only; HTTP error statuses are returned as-is
+_RETRIES = Retry(total=2, backoff_factor=0.2)
+
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=_RETRIES),
+)
@@ -5,20 +5,38 @@ Provides simple text-file-based caching of recently used Google Sheets URLs
 for easy selection in the web interface.
 """
 
-import fcntl
 import logging
+import mmap
+import os
 import re
-from datetime import datetime
+import stat
+import time
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
-import requests
+from ._http import SESSION
 
 logger = logging.getLogger(__name__)
 
 CACHE_FILE = ".sheet_cache.txt"
 MAX_CACHE_ENTRIES = 20
 
+# Seconds after which a leftover cache lock file is treated as abandoned
+CACHE_LOCK_STALE_SECONDS = 10.0
+
+# Most bytes of the edit page read while looking for its <title>
+TITLE_SCAN_LIMIT = 64 * 1024
+
+# Cache file path -> (file signature, parsed entries) from the last read_cache
+_READ_CACHE: Dict[Path, tuple[tuple[int, int, int], List[Dict[str, str]]]] = {}
+
+_SHEET_ID_RE = re.compile(r"docs\.google\.com/spreadsheets/d/([a-zA-Z0-9-_]+)")
+_GID_RE = re.compile(r"[#&]gid=(\d+)")
+_TITLE_RE = re.compile(r"<title>(.+?)(?: - Google Sheets)?</title>")
+_TITLE_SUFFIX_RE = re.compile(r"\s*-\s*Google Sheets$")
+
 
 def get_sheet_title(url: str) -> Optional[str]:
     """
@@ -35,9 +53,7 @@ def get_sheet_title(url: str) -> Optional[str]:
     """
     try:
         # Extract sheet_id from URL
-        sheet_id_match = re.search(
-            r"docs\.google\.com/spreadsheets/d/([a-zA-Z0-9-_]+)", url
-        )
+        sheet_id_match = _SHEET_ID_RE.search(url)
         if not sheet_id_match:
             return None
 
@@ -47,18 +63,29 @@ def get_sheet_title(url: str) -> Optional[str]:
         # Use the /edit page as it has the title in the HTML
         fetch_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit"
 
-        response = requests.get(fetch_url, timeout=5)
-        response.raise_for_status()
+        response = SESSION.get(
+            fetch_url, timeout=5, stream=True, headers={"Accept-Encoding": "gzip"}
+        )
+        try:
+            response.raise_for_status()
+
+            # The title sits in <head>, so stop reading once it has closed
+            # instead of downloading the whole (often 1+ MB) page
+            head = bytearray()
+            for chunk in response.iter_content(chunk_size=4096):
+                head += chunk
+                if b"</title>" in head or len(head) >= TITLE_SCAN_LIMIT:
+                    break
+        finally:
+            response.close()
 
         # Look for title in HTML - it's typically in <title> tag
         # Format: "Document Title - Google Sheets"
-        title_match = re.search(
-            r"<title>(.+?)(?: - Google Sheets)?</title>", response.text
-        )
+        title_match = _TITLE_RE.search(head.decode("utf-8", errors="replace"))
         if title_match:
             title = title_match.group(1).strip()
             # Remove " - Google Sheets" suffix if present
-            title = re.sub(r"\s*-\s*Google Sheets$", "", title)
+            title = _TITLE_SUFFIX_RE.sub("", title)
             return title
 
         return None
@@ -82,8 +109,7 @@ def extract_sheet_info(url: str) -> tuple[str, str]:
         ValueError: If URL is not a valid Google Sheets URL
     """
     # Match any Google Sheets URL format
-    pattern = r"docs\.google\.com/spreadsheets/d/([a-zA-Z0-9-_]+)"
-    match = re.search(pattern, url)
+    match = _SHEET_ID_RE.search(url)
 
     if not match:
         raise ValueError(f"Invalid Google Sheets URL: {url}")
@@ -91,16 +117,112 @@ def extract_sheet_info(url: str) -> tuple[str, str]:
     sheet_id = match.group(1)
 
     # Extract gid (sheet tab ID) - defaults to 0 if not present
-    gid_match = re.search(r"[#&]gid=(\d+)", url)
+    gid_match = _GID_RE.search(url)
     gid = gid_match.group(1) if gid_match else "0"
 
     return sheet_id, gid
 
 
+def _read_lock_owner(lock_path: Path) -> Optional[str]:
+    """Return the "pid timestamp" owner line of a lock file, or None if it is gone."""
+    try:
+        return lock_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def _lock_is_stale(lock_path: Path, owner: str) -> bool:
+    """Whether a lock was taken more than CACHE_LOCK_STALE_SECONDS ago."""
+    try:
+        locked_at = float(owner.split()[1])
+    except (IndexError, ValueError):
+        # Not filled in yet (or its writer died first); fall back to its mtime
+        try:
+            locked_at = lock_path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+    return time.time() - locked_at > CACHE_LOCK_STALE_SECONDS
+
+
+@contextmanager
+def _cache_lock(cache_path: Path):
+    """
+    Hold an exclusive lock for read-modify-write of the cache file.
+
+    The lock is a sibling file created with O_CREAT | O_EXCL, which needs no
+    fcntl and also works on network filesystems. It records the owner's pid
+    and the time it was taken. A lock older than CACHE_LOCK_STALE_SECONDS was
+    left by a writer that died; it is removed after re-reading it to check
+    that it still has the same owner.
+    """
+    lock_path = cache_path.with_name(cache_path.name + ".lock")
+    owner = None
+    while owner is None:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            current = _read_lock_owner(lock_path)
+            if current is None:
+                continue
+            if (
+                _lock_is_stale(lock_path, current)
+                and _read_lock_owner(lock_path) == current
+            ):
+                logger.warning(f"Removing stale cache lock: {lock_path}")
+                lock_path.unlink(missing_ok=True)
+            else:
+                time.sleep(0.01)
+            continue
+        owner = f"{os.getpid()} {time.time()}"
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(owner)
+    try:
+        yield
+    finally:
+        # Leave the lock alone if it was broken as stale and taken by another writer
+        if _read_lock_owner(lock_path) == owner:
+            lock_path.unlink(missing_ok=True)
+
+
+def _replace_cache_file(cache_path: Path, lines: List[str]) -> None:
+    """
+    Atomically replace the cache file with the given entry lines.
+
+    The new file keeps the old file's permissions, or gets the umask default
+    when there is no old file.
+    """
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+            tmp.write("".join(f"{line}\n" for line in lines))
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(cache_path.stat().st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _read_cache_lines(cache_path: Path) -> Iterator[str]:
+    """Yield the cache file's lines, decoding one line at a time."""
+    with open(cache_path, "rb") as f:
+        # mmap refuses empty files, which have no lines anyway
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw_line in iter(mm.readline, b""):
+                yield raw_line.rstrip(b"\r\n").decode("utf-8")
+
+
 def read_cache(output_dir: Path) -> List[Dict[str, str]]:
     """
     Read recent Google Sheets from cache file.
 
+    Parsed entries are reused until the file is rewritten.
+
     Args:
         output_dir: Directory containing cache file
 
@@ -110,14 +232,21 @@ def read_cache(output_dir: Path) -> List[Dict[str, str]]:
     """
     cache_path = output_dir / CACHE_FILE
 
-    if not cache_path.exists():
+    try:
+        st = cache_path.stat()
+    except FileNotFoundError:
         return []
 
+    # Writers swap in a new file, so the inode changes on every rewrite
+    signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _READ_CACHE.get(cache_path)
+    if cached is not None and cached[0] == signature:
+        return list(cached[1])
+
     try:
-        lines = cache_path.read_text().strip().split("\n")
         entries = []
 
-        for line in lines:
+        for line in _read_cache_lines(cache_path):
             if not line or line.count("|") != 4:
                 if line:  # Only warn for non-empty malformed lines
                     logger.warning(f"Skipping malformed cache entry: {line}")
@@ -138,9 +267,13 @@ def read_cache(output_dir: Path) -> List[Dict[str, str]]:
                 logger.warning(f"Error parsing cache line '{line}': {e}")
                 continue
 
-        # Sort by timestamp, most recent first
-        entries.sort(key=lambda x: x["timestamp"], reverse=True)
-        return entries
+        # append_to_cache writes newest-first, so only sort files that
+        # were edited by hand or written while the clock went backwards
+        timestamps = [entry["timestamp"] for entry in entries]
+        if any(a < b for a, b in zip(timestamps, timestamps[1:])):
+            entries.sort(key=lambda x: x["timestamp"], reverse=True)
+        _READ_CACHE[cache_path] = (signature, entries)
+        return list(entries)
 
     except Exception as e:
         logger.error(f"Error reading cache file: {e}")
@@ -167,7 +300,7 @@ def append_to_cache(
     try:
         # Extract sheet info for deduplication
         sheet_id, gid = extract_sheet_info(original_url)
-        timestamp = int(datetime.now().timestamp())
+        timestamp = int(time.time())
 
         # If sheet_name not provided, try to fetch from Google Sheets
         if sheet_name is None:
@@ -182,56 +315,31 @@ def append_to_cache(
         # Ensure output directory exists
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Create cache file if it doesn't exist
-        if not cache_path.exists():
-            cache_path.touch()
-
         # Use file locking for thread safety
-        with open(cache_path, "r+") as f:
-            try:
-                # Acquire exclusive lock (blocking)
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-
-                # Read existing entries
-                content = f.read()
-                existing_lines = [line for line in content.strip().split("\n") if line]
-
-                # Parse existing entries and remove duplicates
-                seen_keys = set()
-                kept_entries = []
-
-                # Add new entry first
-                new_key = (sheet_id, gid)
-                seen_keys.add(new_key)
-                new_entry = f"{timestamp}|{sheet_id}|{gid}|{original_url}|{sheet_name}"
-                kept_entries.append(new_entry)
-
-                # Keep existing entries that aren't duplicates
-                for line in existing_lines:
-                    if line.count("|") != 4:
-                        continue
-
-                    try:
-                        parts = line.split("|")
-                        entry_key = (parts[1], parts[2])  # (sheet_id, gid)
-
-                        if entry_key not in seen_keys:
-                            seen_keys.add(entry_key)
-                            kept_entries.append(line)
-                    except (ValueError, IndexError):
-                        continue
-
-                # Limit to MAX_CACHE_ENTRIES
-                kept_entries = kept_entries[:MAX_CACHE_ENTRIES]
-
-                # Write back to file
-                f.seek(0)
-                f.truncate()
-                f.write("\n".join(kept_entries) + "\n")
-
-            finally:
-                # Release lock
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        with _cache_lock(cache_path):
+            # Read existing entries
+            content = (
+                cache_path.read_text(encoding="utf-8") if cache_path.exists() else ""
+            )
+            existing_lines = [line for line in content.strip().split("\n") if line]
+
+            # Add new entry first; existing lines are already newest-first, so
+            # the file stays sorted for read_cache. The dict keeps the first
+            # line per (sheet_id, gid) in order, dropping older duplicates
+            new_entry = f"{timestamp}|{sheet_id}|{gid}|{original_url}|{sheet_name}"
+            entries = {(sheet_id, gid): new_entry}
+
+            for line in existing_lines:
+                parts = line.split("|")
+                if len(parts) != 5:
+                    continue
+                entries.setdefault((parts[1], parts[2]), line)
+
+            # Limit to MAX_CACHE_ENTRIES
+            kept_entries = list(entries.values())[:MAX_CACHE_ENTRIES]
+
+            # One rename, so a crash never leaves a half-written file
+            _replace_cache_file(cache_path, kept_entries)
 
         logger.info(f"Added to cache: {sheet_name} ({sheet_id})")
 
@@ -276,39 +384,31 @@ def delete_cache_entry(output_dir: Path, sheet_id: str, gid: str = "0") -> bool:
         return False
 
     try:
-        with open(cache_path, "r+") as f:
-            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-            try:
-                content = f.read()
-                lines = [line for line in content.strip().split("\n") if line]
-
-                # Filter out the entry to delete
-                kept_lines = []
-                deleted = False
+        with _cache_lock(cache_path):
+            content = cache_path.read_text(encoding="utf-8")
+            lines = [line for line in content.strip().split("\n") if line]
 
-                for line in lines:
-                    if line.count("|") != 4:
-                        continue
+            # Filter out the entry to delete
+            kept_lines = []
+            deleted = False
 
-                    parts = line.split("|")
-                    if parts[1] == sheet_id and parts[2] == gid:
-                        deleted = True
-                        continue
+            for line in lines:
+                parts = line.split("|")
+                if len(parts) != 5:
+                    continue
 
-                    kept_lines.append(line)
+                if parts[1] == sheet_id and parts[2] == gid:
+                    deleted = True
+                    continue
 
-                if deleted:
-                    # Write back
-                    f.seek(0)
-                    f.truncate()
-                    if kept_lines:
-                        f.write("\n".join(kept_lines) + "\n")
-                    logger.info(f"Deleted cache entry: {sheet_id} (gid={gid})")
+                kept_lines.append(line)
 
-                return deleted
+            if deleted:
+                # Write back
+                _replace_cache_file(cache_path, kept_lines)
+                logger.info(f"Deleted cache entry: {sheet_id} (gid={gid})")
 
-            finally:
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            return deleted
 
     except Exception as e:
         logger.error(f"Error deleting cache entry: {e}")
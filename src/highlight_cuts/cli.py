@@ -1,10 +1,10 @@
 import click
 import logging
 import os
-import tempfile
+import string
 from pathlib import Path
 from .core import process_csv, merge_intervals
-from .ffmpeg import extract_clip, concat_clips
+from .ffmpeg import extract_and_concat
 
 # Configure logging
 logging.basicConfig(
@@ -12,6 +12,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# str.translate table deleting every ASCII character not allowed in output names
+_UNSAFE_ASCII = {
+    cp: None
+    for cp in range(128)
+    if chr(cp) not in string.ascii_letters + string.digits + " _-"
+}
+
 
 @click.command()
 @click.option(
@@ -91,40 +98,29 @@ def main(input_video, csv_file, game, padding, output_dir, dry_run):
                 )
             continue
 
-        # Create temporary directory for this player's clips
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_clips = []
-            logger.info(f"Generating clips for {player}...")
-
-            for i, (start, end) in enumerate(merged):
-                clip_name = f"clip_{i:03d}{video_suffix}"
-                clip_path = os.path.join(temp_dir, clip_name)
-                try:
-                    extract_clip(str(input_path), start, end, clip_path)
-                    temp_clips.append(clip_path)
-                except Exception as e:
-                    logger.error(f"Failed to extract clip {i} for {player}: {e}")
-                    # Continue or abort? Let's abort for now to avoid partial videos
-                    raise click.Abort()
-
-            # Output filename: original_name_PlayerName.ext (Wait, user asked for: remove suffix, add player name, add suffix back)
-            # Actually user said: "take the original filename. remove the suffix. add the playerName. add the suffix back on to the end."
-            # Example: game1.mp4 -> game1_PlayerName.mp4
-            # I should probably sanitize the player name to be safe for filenames
-            safe_player_name = (
-                "".join(c for c in player if c.isalnum() or c in (" ", "_", "-"))
-                .strip()
-                .replace(" ", "_")
+        # Output filename: original_name_PlayerName.ext (Wait, user asked for: remove suffix, add player name, add suffix back)
+        # Actually user said: "take the original filename. remove the suffix. add the playerName. add the suffix back on to the end."
+        # Example: game1.mp4 -> game1_PlayerName.mp4
+        # I should probably sanitize the player name to be safe for filenames
+        if player.isascii():
+            safe_player_name = player.translate(_UNSAFE_ASCII)
+        else:
+            # Keep non-ASCII letters and digits, as str.isalnum allows them
+            safe_player_name = "".join(
+                c for c in player if c.isalnum() or c in (" ", "_", "-")
             )
-            output_filename = f"{video_stem}_{safe_player_name}{video_suffix}"
-            output_file_path = os.path.join(output_dir, output_filename)
-
-            logger.info(f"Concatenating clips into {output_file_path}...")
-            try:
-                concat_clips(temp_clips, output_file_path)
-                logger.info(f"Successfully created {output_file_path}")
-            except Exception as e:
-                logger.error(f"Failed to create final video for {player}: {e}")
+        safe_player_name = safe_player_name.strip().replace(" ", "_")
+        output_filename = f"{video_stem}_{safe_player_name}{video_suffix}"
+        output_file_path = os.path.join(output_dir, output_filename)
+
+        # One ffmpeg run cuts every clip straight from the source and joins them
+        logger.info(f"Cutting {clip_count} clips into {output_file_path}...")
+        try:
+            extract_and_concat(str(input_path), merged, output_file_path)
+            logger.info(f"Successfully created {output_file_path}")
+        except Exception as e:
+            # Log and move on, so one player's failure doesn't stop the others
+            logger.error(f"Failed to create final video for {player}: {e}")
 
 
 if __name__ == "__main__":
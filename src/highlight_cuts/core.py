@@ -1,16 +1,61 @@
+import numpy as np
 import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+import io
 import logging
-from typing import List, Tuple, Dict
+import re
+import time
+from collections import defaultdict
+from functools import lru_cache
+from typing import List, Optional, Tuple, Dict
 from dataclasses import dataclass
-from .utils import parse_time
+from .utils import parse_times
 
 logger = logging.getLogger(__name__)
 
+_SHEET_ID_RE = re.compile(r"/spreadsheets/d/([a-zA-Z0-9-_]+)")
+_GID_RE = re.compile(r"[#&]gid=([0-9]+)")
 
+# merge_intervals switches from the pure-Python sweep to NumPy at this many intervals
+NUMPY_MERGE_MIN_INTERVALS = 128
+
+# Columns process_csv reads; any others in the sheet are skipped by the parser
+_CSV_COLUMNS = {"videoName", "startTime", "stopTime", "playerName", "notes", "include"}
+
+# Every column is read as text. videoName repeats one value per game, so it is
+# read as categorical and the game filter compares integer codes
+_CSV_DTYPES = {col: str for col in _CSV_COLUMNS} | {"videoName": "category"}
+
+# Cells read_csv reads as missing by default ("", "NA", "null", ...); code that
+# parses the sheet without pandas skips these too, so it sees the same rows
+_CSV_NA_VALUES = STR_NA_VALUES
+
+# Accepted "include" values (lowercased, stripped); blank cells read as "nan"
+_INCLUDE_VALUES = {
+    "true": True,
+    "yes": True,
+    "1": True,
+    "false": False,
+    "no": False,
+    "0": False,
+    "": True,  # Blank means True
+    "nan": True,
+}
+
+# Seconds a downloaded Google Sheets CSV is reused before it is revalidated
+SHEET_CACHE_TTL = 60.0
+
+# Export URL -> (monotonic fetch time, CSV bytes, cache validator headers)
+_SHEET_CACHE: Dict[str, Tuple[float, bytes, Dict[str, str]]] = {}
+
+
+@lru_cache(maxsize=256)
 def normalize_sheets_url(url: str) -> str:
     """
     Converts any Google Sheets URL to CSV export format.
 
+    Results are memoized, since the web app normalizes the same few URLs.
+
     Handles:
     - Regular share URLs: .../edit?usp=sharing
     - Direct edit URLs: .../edit#gid=123
@@ -23,21 +68,19 @@ def normalize_sheets_url(url: str) -> str:
     Returns:
         CSV export URL or original input
     """
-    import re
-
     # Not a Google Sheets URL, return as-is
     if "docs.google.com/spreadsheets" not in url:
         return url
 
     # Extract sheet ID
-    match = re.search(r"/spreadsheets/d/([a-zA-Z0-9-_]+)", url)
+    match = _SHEET_ID_RE.search(url)
     if not match:
         return url
 
     sheet_id = match.group(1)
 
     # Extract gid (sheet tab ID) if present
-    gid_match = re.search(r"[#&]gid=([0-9]+)", url)
+    gid_match = _GID_RE.search(url)
     gid = gid_match.group(1) if gid_match else "0"
 
     # Build export URL using gviz endpoint
@@ -48,6 +91,57 @@ def normalize_sheets_url(url: str) -> str:
     return export_url
 
 
+def _fetch_sheet_csv(url: str, max_age: Optional[float] = None) -> bytes:
+    """
+    Downloads a Google Sheets CSV export, reusing a recently fetched copy.
+
+    A download is reused for max_age seconds (SHEET_CACHE_TTL by default).
+    After that it is revalidated with its ETag / Last-Modified headers, so an
+    unchanged sheet answers 304 Not Modified without sending the CSV again.
+
+    Args:
+        url: Normalized Google Sheets CSV export URL
+        max_age: Seconds a cached copy is used without asking the server;
+            0 always revalidates
+
+    Returns:
+        Raw CSV bytes
+    """
+    from ._http import SESSION
+
+    if max_age is None:
+        max_age = SHEET_CACHE_TTL
+
+    now = time.monotonic()
+    cached = _SHEET_CACHE.get(url)
+    if cached is not None and now - cached[0] < max_age:
+        logger.debug(f"Using cached sheet CSV for {url}")
+        return cached[1]
+
+    headers = {}
+    if cached is not None:
+        validators = cached[2]
+        if "ETag" in validators:
+            headers["If-None-Match"] = validators["ETag"]
+        if "Last-Modified" in validators:
+            headers["If-Modified-Since"] = validators["Last-Modified"]
+
+    response = SESSION.get(url, headers=headers)
+    if cached is not None and response.status_code == 304:
+        logger.debug(f"Sheet CSV not modified: {url}")
+        _SHEET_CACHE[url] = (now, cached[1], cached[2])
+        return cached[1]
+
+    response.raise_for_status()
+    validators = {
+        key: response.headers[key]
+        for key in ("ETag", "Last-Modified")
+        if key in response.headers
+    }
+    _SHEET_CACHE[url] = (now, response.content, validators)
+    return response.content
+
+
 def merge_intervals(
     intervals: List[Tuple[float, float]], padding: float = 0.0
 ) -> List[Tuple[float, float]]:
@@ -64,15 +158,35 @@ def merge_intervals(
     if not intervals:
         return []
 
-    # Add padding and ensure non-negative start
+    if len(intervals) >= NUMPY_MERGE_MIN_INTERVALS:
+        return _merge_intervals_numpy(intervals, padding)
+
+    # Add padding and ensure non-negative start, noting whether the starts
+    # are already in order (sheets usually list clips chronologically) and
+    # whether each interval also begins after the previous one ends
     padded = []
+    in_order = True
+    disjoint = True
+    prev_start = 0.0
+    prev_end = -1.0
     for start, end in intervals:
         s = max(0.0, start - padding)
         e = end + padding
         padded.append((s, e))
+        if s < prev_start:
+            in_order = False
+        if s <= prev_end:
+            disjoint = False
+        prev_start = s
+        prev_end = e
+
+    # Nothing to sort or merge
+    if in_order and disjoint:
+        return padded
 
     # Sort by start time
-    padded.sort(key=lambda x: x[0])
+    if not in_order:
+        padded.sort(key=lambda x: x[0])
 
     merged = []
     current_start, current_end = padded[0]
@@ -90,7 +204,33 @@ def merge_intervals(
     return merged
 
 
-@dataclass
+def _merge_intervals_numpy(
+    intervals: List[Tuple[float, float]], padding: float
+) -> List[Tuple[float, float]]:
+    """
+    NumPy version of merge_intervals for long interval lists.
+
+    After sorting by start, a new merged interval begins wherever an interval
+    starts after the running maximum of all earlier ends.
+    """
+    arr = np.asarray(intervals, dtype=np.float64)
+    starts = np.maximum(0.0, arr[:, 0] - padding)
+    ends = arr[:, 1] + padding
+
+    if (starts[1:] < starts[:-1]).any():
+        order = np.argsort(starts, kind="stable")
+        starts = starts[order]
+        ends = ends[order]
+    ends_cummax = np.maximum.accumulate(ends)
+
+    breaks = np.flatnonzero(starts[1:] > ends_cummax[:-1]) + 1
+    merged_starts = starts[np.concatenate(([0], breaks))]
+    merged_ends = ends_cummax[np.concatenate((breaks - 1, [len(starts) - 1]))]
+    return list(zip(merged_starts.tolist(), merged_ends.tolist()))
+
+
+# Slots drop the per-instance __dict__; one Clip is built per sheet row
+@dataclass(slots=True)
 class Clip:
     start: float
     end: float
@@ -117,15 +257,18 @@ def process_csv(csv_source: str, game_name: str) -> Dict[str, List[Clip]]:
         # Use requests for Google Sheets URLs to handle redirects properly
         # urllib has issues with Google's redirect pattern containing wildcards
         if csv_source.startswith("https://docs.google.com/spreadsheets"):
-            import requests
-            import io
-
-            response = requests.get(csv_source)
-            response.raise_for_status()
-            df = pd.read_csv(io.StringIO(response.text))
+            source = io.BytesIO(_fetch_sheet_csv(csv_source))
         else:
             # Use pandas directly for local files and other URLs
-            df = pd.read_csv(csv_source)
+            source = csv_source
+        # Fixed dtypes skip inference and keep names like "23" as strings
+        # instead of turning them into numbers
+        df = pd.read_csv(
+            source,
+            usecols=lambda col: col in _CSV_COLUMNS,
+            dtype=_CSV_DTYPES,
+            engine="c",
+        )
     except Exception as e:
         logger.error(f"Failed to read CSV: {e}")
         raise
@@ -152,61 +295,63 @@ def process_csv(csv_source: str, game_name: str) -> Dict[str, List[Clip]]:
             f"CSV missing required columns. Found: {df.columns}, Expected: {required_cols}"
         )
 
-    # Filter by game
-    game_df = df[df["videoName"] == game_name].copy()
-    if game_df.empty:
+    # Select the game's rows and work on those columns directly, without
+    # building a filtered copy of the frame
+    videos = df["videoName"].cat
+    if game_name in videos.categories:
+        mask = videos.codes.to_numpy() == videos.categories.get_loc(game_name)
+    else:
+        mask = np.zeros(len(df), dtype=bool)
+    if not mask.any():
         logger.warning(f"No clips found for game '{game_name}'")
         return {}
+    row_count = int(mask.sum())
 
     # Parse times
     try:
-        game_df["start_seconds"] = game_df["startTime"].apply(str).apply(parse_time)
-        game_df["end_seconds"] = game_df["stopTime"].apply(str).apply(parse_time)
+        start_seconds = parse_times(df["startTime"][mask])
+        end_seconds = parse_times(df["stopTime"][mask])
     except Exception as e:
         logger.error(f"Error parsing timestamps: {e}")
         raise
 
     # Parse include column
-    if "include" in game_df.columns:
-
-        def parse_include(val):
-            s = str(val).strip().lower()
-            if s in ("true", "yes", "1"):
-                return True
-            if s in ("false", "no", "0"):
-                return False
-            if s == "" or s == "nan" or pd.isna(val):
-                return True  # Blank means True
+    if "include" in df.columns:
+        include = df["include"][mask]
+        parsed = include.astype(str).str.strip().str.lower().map(_INCLUDE_VALUES)
+        invalid = parsed.isna()
+        if invalid.any():
             # Detect anything that is not true or false or blank
-            raise ValueError(f"Invalid value for 'include': {val}")
-
-        try:
-            game_df["included"] = game_df["include"].apply(parse_include)
-        except ValueError as e:
-            logger.error(f"Validation error in include column: {e}")
-            raise
+            bad_values = ", ".join(map(str, include[invalid].unique()))
+            msg = f"Invalid value for 'include': {bad_values}"
+            logger.error(f"Validation error in include column: {msg}")
+            raise ValueError(msg)
+        included = parsed.tolist()
     else:
-        game_df["included"] = True
+        included = [True] * row_count
 
     # Handle notes
-    if "notes" not in game_df.columns:
-        game_df["notes"] = ""
+    if "notes" not in df.columns:
+        notes = [""] * row_count
     else:
-        game_df["notes"] = game_df["notes"].fillna("")
-
-    # Group by player
-    player_clips = {}
-    for player, group in game_df.groupby("playerName"):
-        clips = []
-        for _, row in group.iterrows():
-            clips.append(
-                Clip(
-                    start=row["start_seconds"],
-                    end=row["end_seconds"],
-                    notes=str(row["notes"]),
-                    included=row["included"],
-                )
-            )
-        player_clips[player] = clips
-
-    return player_clips
+        notes = df["notes"][mask].fillna("").tolist()
+
+    # Group by player in a single pass over the columns (as plain Python values)
+    players = df["playerName"][mask]
+    player_clips = defaultdict(list)
+    for has_player, player, start, end, note, include in zip(
+        players.notna().tolist(),
+        players.tolist(),
+        start_seconds.tolist(),
+        end_seconds.tolist(),
+        notes,
+        included,
+    ):
+        if not has_player:
+            continue  # Rows without a player are dropped, as groupby does
+        player_clips[player].append(
+            Clip(start=start, end=end, notes=str(note), included=include)
+        )
+
+    # Players in sorted order, as groupby returned them
+    return {player: player_clips[player] for player in sorted(player_clips)}
@@ -1,10 +1,17 @@
 import subprocess
 import logging
 import os
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Default cap on concurrent ffmpeg processes in extract_clips_parallel
+MAX_EXTRACT_WORKERS = 8
+
+# Containers whose muxer takes -movflags +faststart (moov atom moved to the front)
+_FASTSTART_SUFFIXES = (".mp4", ".mov")
+
 
 def extract_clip(input_path: str, start: float, end: float, output_path: str) -> dict:
     """
@@ -36,16 +43,58 @@ def extract_clip(input_path: str, start: float, end: float, output_path: str) ->
     logger.debug(f"Running command: {' '.join(cmd)}")
     try:
         result = subprocess.run(cmd, check=True, capture_output=True)
+        # Output is returned as raw bytes; callers that show it decode it then
         return {
             "command": " ".join(cmd),
-            "stdout": result.stdout.decode(),
-            "stderr": result.stderr.decode(),
+            "stdout": result.stdout,
+            "stderr": result.stderr,
         }
     except subprocess.CalledProcessError as e:
         logger.error(f"FFmpeg failed: {e.stderr.decode()}")
         raise
 
 
+def extract_clips_parallel(
+    input_path: str,
+    specs: List[Tuple[float, float, str]],
+    max_workers: Optional[int] = None,
+) -> List[dict]:
+    """
+    Runs extract_clip for several clips of one video concurrently.
+
+    Each extraction is an independent stream-copy ffmpeg process, so the
+    worker threads only wait on subprocesses.
+
+    Args:
+        input_path: Path to source video.
+        specs: (start, end, output_path) for each clip.
+        max_workers: Concurrent ffmpeg processes. Defaults to
+            min(MAX_EXTRACT_WORKERS, CPU count).
+
+    Returns:
+        The extract_clip results, in the same order as specs.
+
+    Raises:
+        subprocess.CalledProcessError: If an extraction fails. Extractions
+            that have not started yet are cancelled.
+    """
+    if not specs:
+        return []
+    if max_workers is None:
+        max_workers = min(MAX_EXTRACT_WORKERS, os.cpu_count() or 1)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(specs))) as executor:
+        futures = [
+            executor.submit(extract_clip, input_path, start, end, output_path)
+            for start, end, output_path in specs
+        ]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+
 def concat_clips(clip_paths: List[str], output_path: str) -> dict:
     """
     Concatenates multiple clips into a single video file.
@@ -58,11 +107,11 @@ def concat_clips(clip_paths: List[str], output_path: str) -> dict:
         return
 
     # Create a temporary file list for ffmpeg concat demuxer
+    # Resolve relative paths against one getcwd() and write the list at once
     list_file = output_path + ".txt"
+    cwd = os.getcwd()
     with open(list_file, "w") as f:
-        for path in clip_paths:
-            abs_path = os.path.abspath(path)
-            f.write(f"file '{abs_path}'\n")
+        f.write("".join(f"file '{os.path.join(cwd, path)}'\n" for path in clip_paths))
 
     cmd = [
         "ffmpeg",
@@ -85,8 +134,8 @@ def concat_clips(clip_paths: List[str], output_path: str) -> dict:
         result = subprocess.run(cmd, check=True, capture_output=True)
         return {
             "command": " ".join(cmd),
-            "stdout": result.stdout.decode(),
-            "stderr": result.stderr.decode(),
+            "stdout": result.stdout,
+            "stderr": result.stderr,
         }
     except subprocess.CalledProcessError as e:
         logger.error(f"FFmpeg concat failed: {e.stderr.decode()}")
@@ -96,6 +145,67 @@ def concat_clips(clip_paths: List[str], output_path: str) -> dict:
             os.remove(list_file)
 
 
+def extract_and_concat(
+    input_path: str, intervals: List[Tuple[float, float]], output_path: str
+) -> dict:
+    """
+    Cuts several intervals out of one video and joins them in a single ffmpeg run.
+
+    Each interval is a concat demuxer entry pointing back at the source with
+    inpoint/outpoint directives, so one process replaces an extraction per
+    clip plus the final concat.
+
+    Args:
+        input_path: Path to source video.
+        intervals: (start, end) pairs in seconds, in output order.
+        output_path: Path to save the final video.
+    """
+    if not intervals:
+        return
+
+    # Quote the source path for the concat list ("'" is written as '\'')
+    source = os.path.abspath(input_path).replace("'", "'\\''")
+    list_file = output_path + ".txt"
+    with open(list_file, "w") as f:
+        f.write(
+            "".join(
+                f"file '{source}'\ninpoint {start:.3f}\noutpoint {end:.3f}\n"
+                for start, end in intervals
+            )
+        )
+
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        list_file,
+        "-c",
+        "copy",
+    ]
+    if os.path.splitext(output_path)[1].lower() in _FASTSTART_SUFFIXES:
+        cmd += ["-movflags", "+faststart"]
+    cmd.append(output_path)
+
+    logger.debug(f"Running extract+concat command: {' '.join(cmd)}")
+    try:
+        result = subprocess.run(cmd, check=True, capture_output=True)
+        return {
+            "command": " ".join(cmd),
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+        }
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFmpeg extract+concat failed: {e.stderr.decode()}")
+        raise
+    finally:
+        if os.path.exists(list_file):
+            os.remove(list_file)
+
+
 def generate_hls(
     input_path: str, output_dir: str, segment_time: float = 6.0, reencode: bool = False
 ) -> dict:
@@ -141,8 +251,8 @@ def generate_hls(
         result = subprocess.run(cmd, check=True, capture_output=True)
         return {
             "command": " ".join(cmd),
-            "stdout": result.stdout.decode(),
-            "stderr": result.stderr.decode(),
+            "stdout": result.stdout,
+            "stderr": result.stderr,
         }
     except subprocess.CalledProcessError as e:
         logger.error(f"FFmpeg HLS generation failed: {e.stderr.decode()}")
@@ -1,29 +1,36 @@
+import csv
+import io
 import logging
 import os
 import shutil
 import tempfile
 import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator, Optional, Tuple
 import glob
 
-from fastapi import FastAPI, Request, Form, BackgroundTasks, HTTPException
+from fastapi import FastAPI, Request, Form, HTTPException
 from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import pandas as pd
 import yaml
 
 from .core import process_csv, merge_intervals
-from .ffmpeg import extract_clip, concat_clips, generate_hls
+from .ffmpeg import extract_clips_parallel, concat_clips, generate_hls
 from .cache import read_cache, append_to_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Highlight Cuts Web")
+# Timestamp suffix added to output names: _YYYYMMDD_HHMMSS
+_TIMESTAMP_STEM_RE = re.compile(r"_\d{8}_\d{6}$")
+_TIMESTAMP_FILENAME_RE = re.compile(r"_\d{8}_\d{6}(\.[^.]+)$")
 
 # Directories
 BASE_DIR = Path(__file__).resolve().parent
@@ -38,6 +45,27 @@ MAX_OUTPUT_PER_PLAYER_GAME = int(
 HLS_SEGMENT_TIME = float(os.getenv("HIGHLIGHT_CUTS_HLS_SEGMENT_TIME", "6.0"))
 HLS_REENCODE = os.getenv("HIGHLIGHT_CUTS_HLS_REENCODE", "false").lower() == "true"
 
+# Seconds a scanned video library is reused while its directories are unchanged
+VIDEO_STRUCTURE_TTL = 5.0
+MAX_CONCURRENT_JOBS = int(os.getenv("HIGHLIGHT_CUTS_MAX_CONCURRENT_JOBS", "2"))
+
+# Highlight jobs run here rather than as BackgroundTasks, so a long ffmpeg run
+# neither holds up its response nor takes threads from the request handlers.
+# Threads are enough: the heavy lifting happens in ffmpeg child processes.
+JOB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_JOBS, thread_name_prefix="highlight-job"
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Drop queued jobs on shutdown; running ones finish their current ffmpeg call
+    JOB_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(title="Highlight Cuts Web", lifespan=lifespan)
+
 # Ensure directories exist
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 if not DATA_DIR.exists():
@@ -72,6 +100,34 @@ def remove_hls_artifacts(mp4_path: Path) -> None:
         shutil.rmtree(hls_dir, ignore_errors=True)
 
 
+def _walk_files(
+    root: Path, extensions: set, ignore_case: bool = False
+) -> Iterator[os.DirEntry]:
+    """
+    Yield entries for files under root whose extension is in extensions.
+
+    Extensions are matched case-sensitively, like rglob(f"*{ext}"), unless
+    ignore_case is set; extensions must then be lowercase. Directory entries
+    from os.scandir already know their type, so unlike rglob("*") this needs
+    no stat per entry and builds no Path objects for files that are skipped.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    ext = os.path.splitext(entry.name)[1]
+                    if ignore_case:
+                        ext = ext.lower()
+                    if ext in extensions and entry.is_file():
+                        yield entry
+        except OSError:
+            continue
+
+
 def enforce_output_limits(
     output_dir: Path,
     max_total: int = MAX_OUTPUT_TOTAL,
@@ -81,21 +137,18 @@ def enforce_output_limits(
     files = []
     # Support multiple video formats (excluding .ts which are HLS segments)
     video_extensions = {".mp4", ".mov", ".mkv", ".avi"}
-    for ext in video_extensions:
-        for f in output_dir.rglob(f"*{ext}"):
-            if not f.is_file():
-                continue
-            rel = f.relative_to(output_dir)
-            player_dir = rel.parts[0] if len(rel.parts) > 1 else "Unknown"
-            base_pattern = f.stem.rsplit("_", 2)[0]
-            mtime = os.path.getmtime(f)
-            files.append(
-                {
-                    "path": f,
-                    "key": f"{player_dir}|{base_pattern}",
-                    "mtime": mtime,
-                }
-            )
+    for entry in _walk_files(output_dir, video_extensions):
+        f = Path(entry.path)
+        rel = f.relative_to(output_dir)
+        player_dir = rel.parts[0] if len(rel.parts) > 1 else "Unknown"
+        base_pattern = f.stem.rsplit("_", 2)[0]
+        files.append(
+            {
+                "path": f,
+                "key": f"{player_dir}|{base_pattern}",
+                "mtime": entry.stat().st_mtime,
+            }
+        )
 
     # Per player/game limit
     to_delete = set()
@@ -126,89 +179,168 @@ def enforce_output_limits(
             logger.warning(f"Could not delete {path}: {e}")
 
 
+# DATA_DIR -> (scan time, directory signature, structure) from the last scan
+_VIDEO_STRUCTURE_CACHE: Dict[Path, Tuple[float, tuple, Dict]] = {}
+
+
+def _data_dir_signature(data_dir: Path) -> Optional[tuple]:
+    """
+    Identity and mtime of the data directory and its team/tournament folders.
+
+    Adding or removing a game changes its tournament folder's mtime, so this
+    catches library changes with a few stats instead of a full walk.
+    """
+    try:
+        st = data_dir.stat()
+    except FileNotFoundError:
+        return None
+    signature = [(str(data_dir), st.st_ino, st.st_mtime_ns)]
+    level = [str(data_dir)]
+    for _ in range(2):
+        subdirs = []
+        for path in level:
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            st = entry.stat()
+                            signature.append((entry.path, st.st_ino, st.st_mtime_ns))
+                            subdirs.append(entry.path)
+            except OSError:
+                continue
+        level = subdirs
+    return tuple(signature)
+
+
+# games.yaml path -> (file signature, parsed "games" mapping) from the last read
+_METADATA_CACHE: Dict[Path, Tuple[Tuple[int, int, int], dict]] = {}
+
+# libyaml's loader parses several times faster when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_metadata(dir_path: Path) -> dict:
+    """
+    Read the "games" mapping from a tournament folder's games.yaml (or .yml).
+
+    Parsed files are reused until the file is rewritten.
+    """
+    for candidate in ("games.yaml", "games.yml"):
+        metadata_file = dir_path / candidate
+        try:
+            st = metadata_file.stat()
+        except FileNotFoundError:
+            continue
+
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = _METADATA_CACHE.get(metadata_file)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        try:
+            with open(metadata_file, "r") as f:
+                data = yaml.load(f, Loader=_YAML_LOADER) or {}
+                games = data.get("games", {})
+        except Exception as e:
+            logger.warning(f"Failed to read metadata {metadata_file}: {e}")
+            continue
+        _METADATA_CACHE[metadata_file] = (signature, games)
+        return games
+    return {}
+
+
 def get_video_structure() -> Dict:
     """
     Scan data directory for video files in format: team/tournament/game.mp4
     Returns a nested dict: {team: {tournament: [{name, path, title, stream_url, suffix}]}}
+
+    A scan is reused for up to VIDEO_STRUCTURE_TTL seconds while no team or
+    tournament folder has changed. The TTL bounds how long edits that don't
+    touch those folders (games.yaml contents, deeper folders) go unseen.
     """
+    now = time.monotonic()
+    signature = _data_dir_signature(DATA_DIR)
+    cached = _VIDEO_STRUCTURE_CACHE.get(DATA_DIR)
+    if (
+        cached is not None
+        and now - cached[0] < VIDEO_STRUCTURE_TTL
+        and cached[1] == signature
+    ):
+        return cached[2]
+
+    structure = _scan_video_structure()
+    _VIDEO_STRUCTURE_CACHE[DATA_DIR] = (now, signature, structure)
+    return structure
+
+
+def _scan_video_structure() -> Dict:
+    """Walk DATA_DIR and build the structure returned by get_video_structure."""
     extensions = {".mp4", ".mov", ".mkv", ".avi", ".ts"}
     structure = {}
 
-    def load_metadata(dir_path: Path) -> dict:
-        for candidate in ("games.yaml", "games.yml"):
-            metadata_file = dir_path / candidate
-            if metadata_file.exists():
-                try:
-                    with open(metadata_file, "r") as f:
-                        data = yaml.safe_load(f) or {}
-                        return data.get("games", {})
-                except Exception as e:
-                    logger.warning(f"Failed to read metadata {metadata_file}: {e}")
-        return {}
-
     if DATA_DIR.exists():
         # Preload metadata per tournament dir
         metadata_cache = {}
 
-        for f in DATA_DIR.rglob("*"):
-            if f.is_file() and f.suffix.lower() in extensions:
-                rel_path = f.relative_to(DATA_DIR)
-                parts = rel_path.parts
-
-                # Expected: team/tournament/game.mp4
-                if len(parts) >= 3:
-                    team = parts[0]
-                    tournament = parts[1]
-                    tournament_dir = DATA_DIR / team / tournament
-                    if tournament_dir not in metadata_cache:
-                        metadata_cache[tournament_dir] = load_metadata(tournament_dir)
-                    meta = metadata_cache[tournament_dir].get(f.stem, {})
-
-                    game_name = f.stem
-                    title = meta.get("title") or game_name
-                    stream_url = meta.get("stream_url")
-                    poster = meta.get("poster")
-                    notes = meta.get("notes")
-
-                    if team not in structure:
-                        structure[team] = {}
-                    if tournament not in structure[team]:
-                        structure[team][tournament] = []
-
-                    structure[team][tournament].append(
-                        {
-                            "name": game_name,
-                            "title": title,
-                            "path": str(rel_path),
-                            "suffix": f.suffix.lower(),
-                            "stream_url": stream_url,
-                            "poster": poster,
-                            "notes": notes,
-                        }
-                    )
-                else:
-                    # Handle files not in expected structure (e.g. root or 1 level deep)
-                    # Put them in "Uncategorized" -> "Misc"
-                    team = "Uncategorized"
-                    tournament = "Misc"
-                    game_name = f.stem
-
-                    if team not in structure:
-                        structure[team] = {}
-                    if tournament not in structure[team]:
-                        structure[team][tournament] = []
-
-                    structure[team][tournament].append(
-                        {
-                            "name": game_name,
-                            "title": game_name,
-                            "path": str(rel_path),
-                            "suffix": f.suffix.lower(),
-                            "stream_url": None,
-                            "poster": None,
-                            "notes": None,
-                        }
-                    )
+        for entry in _walk_files(DATA_DIR, extensions, ignore_case=True):
+            f = Path(entry.path)
+            rel_path = f.relative_to(DATA_DIR)
+            parts = rel_path.parts
+
+            # Expected: team/tournament/game.mp4
+            if len(parts) >= 3:
+                team = parts[0]
+                tournament = parts[1]
+                tournament_dir = DATA_DIR / team / tournament
+                if tournament_dir not in metadata_cache:
+                    metadata_cache[tournament_dir] = _load_metadata(tournament_dir)
+                meta = metadata_cache[tournament_dir].get(f.stem, {})
+
+                game_name = f.stem
+                title = meta.get("title") or game_name
+                stream_url = meta.get("stream_url")
+                poster = meta.get("poster")
+                notes = meta.get("notes")
+
+                if team not in structure:
+                    structure[team] = {}
+                if tournament not in structure[team]:
+                    structure[team][tournament] = []
+
+                structure[team][tournament].append(
+                    {
+                        "name": game_name,
+                        "title": title,
+                        "path": str(rel_path),
+                        "suffix": f.suffix.lower(),
+                        "stream_url": stream_url,
+                        "poster": poster,
+                        "notes": notes,
+                    }
+                )
+            else:
+                # Handle files not in expected structure (e.g. root or 1 level deep)
+                # Put them in "Uncategorized" -> "Misc"
+                team = "Uncategorized"
+                tournament = "Misc"
+                game_name = f.stem
+
+                if team not in structure:
+                    structure[team] = {}
+                if tournament not in structure[team]:
+                    structure[team][tournament] = []
+
+                structure[team][tournament].append(
+                    {
+                        "name": game_name,
+                        "title": game_name,
+                        "path": str(rel_path),
+                        "suffix": f.suffix.lower(),
+                        "stream_url": None,
+                        "poster": None,
+                        "notes": None,
+                    }
+                )
 
     # Sort keys
     sorted_structure = {}
@@ -253,9 +385,12 @@ async def get_cached_sheets():
 
 
 @app.post("/parse-sheet", response_class=HTMLResponse)
-async def parse_sheet(request: Request, sheet_url: str = Form(...)):
+def parse_sheet(request: Request, sheet_url: str = Form(...)):
     """
     Parses the Google Sheet and returns HTMX partials for Game and Player dropdowns.
+
+    A plain def, so FastAPI runs it in its threadpool: the sheet download and
+    title lookup block, and would otherwise stall the event loop.
     """
     try:
         # We need to get all unique games and players
@@ -265,40 +400,52 @@ async def parse_sheet(request: Request, sheet_url: str = Form(...)):
         # or better, refactor core. But to avoid breaking changes, I'll use process_csv's normalize
         # and then read it.
 
-        from .core import normalize_sheets_url
-        import requests
-        import io
+        from ._http import SESSION
+        from .core import _CSV_NA_VALUES, _fetch_sheet_csv, normalize_sheets_url
 
         url = normalize_sheets_url(sheet_url)
 
         if url.startswith("https://docs.google.com/spreadsheets"):
-            response = requests.get(url)
+            # Always revalidate, and refresh the cache entry that /get-clips
+            # and processing read, so they cut from the rows shown here
+            content = _fetch_sheet_csv(url, max_age=0)
+        elif url.startswith(("https://", "http://")):
+            # Direct CSV url
+            response = SESSION.get(url)
             response.raise_for_status()
-            df = pd.read_csv(io.StringIO(response.text))
+            content = response.content
         else:
-            # Assume local path (testing) or direct CSV url
-            df = pd.read_csv(url)
-
-        if "videoName" not in df.columns or "playerName" not in df.columns:
+            # Assume local path (testing)
+            content = Path(url).read_bytes()
+
+        # Only the game and player of each row are needed, so count them with
+        # the csv module rather than loading the sheet into a DataFrame
+        reader = csv.reader(io.StringIO(content.decode("utf-8-sig")))
+        header = next(reader, [])
+        if "videoName" not in header or "playerName" not in header:
             return "<div class='error'>Invalid CSV: Missing videoName or playerName columns</div>"
+        game_col = header.index("videoName")
+        player_col = header.index("playerName")
 
-        # Group by game and player and count clips
+        # Count clips per game and player
         # We can also check for 'include' column to count only included clips?
         # For now, let's count all clips to match the "clip_count" requirement.
-        summary = (
-            df.groupby(["videoName", "playerName"]).size().reset_index(name="count")
-        )
-
+        counts = Counter()
+        for record in reader:
+            if len(record) <= max(game_col, player_col):
+                continue
+            game = record[game_col]
+            player = record[player_col]
+            # Rows missing either value are skipped, as groupby skipped them;
+            # "NA", "null" and the like count as missing, as in read_csv
+            if game not in _CSV_NA_VALUES and player not in _CSV_NA_VALUES:
+                counts[(game, player)] += 1
+
+        rows = []
         # Sort by Game then Player
-        summary = summary.sort_values(["videoName", "playerName"])
-
-        rows = ""
-        for _, row in summary.iterrows():
-            game = row["videoName"]
-            player = row["playerName"]
-            count = row["count"]
-
-            rows += f"""
+        for (game, player), count in sorted(counts.items()):
+            rows.append(
+                f"""
             <tr onclick="selectSelection(this, '{game}', '{player}')"
                 hx-post="/get-clips"
                 hx-vals='{{"game": "{game}", "player": "{player}"}}'
@@ -310,6 +457,7 @@ async def parse_sheet(request: Request, sheet_url: str = Form(...)):
                 <td class="px-6 py-1 whitespace-nowrap text-sm text-gray-500">{count}</td>
             </tr>
             """
+            )
 
         # Add to cache with document title (async, don't wait for it)
         # This happens on successful parse, so user gets immediate feedback
@@ -328,7 +476,7 @@ async def parse_sheet(request: Request, sheet_url: str = Form(...)):
                         </tr>
                     </thead>
                     <tbody class="bg-white divide-y divide-gray-200">
-                        {rows}
+                        {"".join(rows)}
                     </tbody>
                 </table>
             </div>
@@ -343,6 +491,13 @@ async def parse_sheet(request: Request, sheet_url: str = Form(...)):
         return f"<div id='sheet-status' hx-swap-oob='true' class='text-red-600'>Error: {str(e)}</div>"
 
 
+def _output_text(output) -> str:
+    """Decode ffmpeg output captured as bytes for the debug log."""
+    if isinstance(output, bytes):
+        return output.decode(errors="replace")
+    return output
+
+
 def process_video_task(
     video_filename: str,
     sheet_url: str,
@@ -394,21 +549,23 @@ def process_video_task(
         # 2. Extract and Concat
         debug_logs = []
         with tempfile.TemporaryDirectory() as temp_dir:
-            temp_clips = []
-            for i, (start, end) in enumerate(merged):
-                clip_name = f"clip_{i:03d}{input_path.suffix}"
-                clip_path = os.path.join(temp_dir, clip_name)
-                logger.info(f"Extracting clip {i}: start={start}, end={end}")
-
-                result = extract_clip(str(input_path), start, end, clip_path)
+            temp_clips = [
+                os.path.join(temp_dir, f"clip_{i:03d}{input_path.suffix}")
+                for i in range(len(merged))
+            ]
+            logger.info(f"Extracting {len(merged)} clips")
+            results = extract_clips_parallel(
+                str(input_path),
+                [(start, end, path) for (start, end), path in zip(merged, temp_clips)],
+            )
+            for i, ((start, end), result) in enumerate(zip(merged, results)):
+                logger.info(f"Extracted clip {i}: start={start}, end={end}")
                 result["type"] = "extract"
                 result["clip_index"] = i
                 result["start"] = start
                 result["end"] = end
                 debug_logs.append(result)
 
-                temp_clips.append(clip_path)
-
             result = concat_clips(temp_clips, str(output_path))
             if result:
                 result["type"] = "concat"
@@ -452,8 +609,8 @@ def process_video_task(
                 f.write(f"Command: {entry['command']}\n")
                 if "start" in entry:
                     f.write(f"Time: {entry['start']} -> {entry['end']}\n")
-                f.write(f"Stdout: {entry['stdout']}\n")
-                f.write(f"Stderr: {entry['stderr']}\n")
+                f.write(f"Stdout: {_output_text(entry['stdout'])}\n")
+                f.write(f"Stderr: {_output_text(entry['stderr'])}\n")
                 f.write("-" * 80 + "\n\n")
 
     except Exception as e:
@@ -463,7 +620,6 @@ def process_video_task(
 
 @app.post("/process", response_class=HTMLResponse)
 async def process(
-    background_tasks: BackgroundTasks,
     video_filename: str = Form(...),
     sheet_url: str = Form(...),
     game: str = Form(...),
@@ -549,7 +705,7 @@ async def process(
     output_filename = f"{safe_tournament}_{safe_game}_{timestamp}{input_path.suffix}"
 
     # Run in background
-    background_tasks.add_task(
+    JOB_EXECUTOR.submit(
         process_video_task,
         video_filename,
         sheet_url,
@@ -572,6 +728,22 @@ async def process(
     """
 
 
+def time_ago(timestamp: float, now: float) -> str:
+    """Format a Unix timestamp as human-readable time before now."""
+    diff = now - timestamp
+    if diff < 60:
+        return "Just now"
+    elif diff < 3600:
+        mins = int(diff // 60)
+        return f"{mins} minute{'s' if mins != 1 else ''} ago"
+    elif diff < 86400:
+        hours = int(diff // 3600)
+        return f"{hours} hour{'s' if hours != 1 else ''} ago"
+    else:
+        days = int(diff // 86400)
+        return f"{days} day{'s' if days != 1 else ''} ago"
+
+
 @app.get("/files", response_class=HTMLResponse)
 async def list_files():
     """Returns a list of generated files in the output directory."""
@@ -580,47 +752,32 @@ async def list_files():
         # Find all video files recursively (common video extensions)
         # NOTE: .ts files are excluded as they are HLS segments, not main videos
         video_extensions = {".mp4", ".mov", ".mkv", ".avi"}
-        for ext in video_extensions:
-            for f in OUTPUT_DIR.rglob(f"*{ext}"):
-                if f.is_file() and not f.name.startswith("."):
-                    files.append(f)
+        for entry in _walk_files(OUTPUT_DIR, video_extensions):
+            if not entry.name.startswith("."):
+                files.append((Path(entry.path), entry.stat().st_mtime))
         # Sort by modification time, newest first
-        files = sorted(files, key=os.path.getmtime, reverse=True)
-
-    def time_ago(timestamp):
-        """Format timestamp as human-readable time ago."""
-        from datetime import datetime, timedelta
-
-        diff = datetime.now() - datetime.fromtimestamp(timestamp)
-        if diff < timedelta(minutes=1):
-            return "Just now"
-        elif diff < timedelta(hours=1):
-            mins = int(diff.total_seconds() / 60)
-            return f"{mins} minute{'s' if mins != 1 else ''} ago"
-        elif diff < timedelta(days=1):
-            hours = int(diff.total_seconds() / 3600)
-            return f"{hours} hour{'s' if hours != 1 else ''} ago"
-        else:
-            days = diff.days
-            return f"{days} day{'s' if days != 1 else ''} ago"
+        files.sort(key=lambda item: item[1], reverse=True)
 
-    html = "<ul class='divide-y divide-gray-100 bg-white rounded-md border border-gray-200 shadow-sm'>"
-    for f in files:
+    now = time.time()
+    html = [
+        "<ul class='divide-y divide-gray-100 bg-white rounded-md border border-gray-200 shadow-sm'>"
+    ]
+    for f, mtime in files:
         # Determine relative path and display info
         rel_path = f.relative_to(OUTPUT_DIR)
-        mtime = os.path.getmtime(f)
-        time_str = time_ago(mtime)
+        time_str = time_ago(mtime, now)
 
         parent_parts = rel_path.parts[:-1]
         dir_display = "/".join(parent_parts) if parent_parts else "Root"
         dir_display = dir_display.replace("_", " ")
 
         base_stem = f.stem
-        base_stem = re.sub(r"_\d{8}_\d{6}$", "", base_stem)
+        base_stem = _TIMESTAMP_STEM_RE.sub("", base_stem)
         game_display = base_stem.replace("_", " ")
         display_name = f.name
 
-        html += f"""
+        html.append(
+            f"""
         <li class="flex items-center justify-between p-2 hover:bg-gray-50 transition">
             <div class="min-w-0 flex-1 flex items-center gap-3 mr-4">
                 <!-- Video Icon -->
@@ -651,8 +808,9 @@ async def list_files():
             </div>
         </li>
         """
-    html += "</ul>"
-    return html
+        )
+    html.append("</ul>")
+    return "".join(html)
 
 
 @app.get("/player/{file_path:path}", response_class=HTMLResponse)
@@ -718,9 +876,7 @@ async def download_file(file_path: str):
     # Download as: tournament_game.mp4
     original_name = Path(file_path).name
     # Remove timestamp pattern _YYYYMMDD_HHMMSS before extension
-    import re
-
-    clean_name = re.sub(r"_\d{8}_\d{6}(\.[^.]+)$", r"\1", original_name)
+    clean_name = _TIMESTAMP_FILENAME_RE.sub(r"\1", original_name)
 
     return FileResponse(full_path, filename=clean_name)
 
@@ -732,7 +888,7 @@ def format_seconds(seconds: float) -> str:
 
 
 @app.post("/get-clips", response_class=HTMLResponse)
-async def get_clips(
+def get_clips(
     request: Request,
     sheet_url: str = Form(...),
     game: str = Form(...),
@@ -740,6 +896,9 @@ async def get_clips(
 ):
     """
     Returns an HTML table of clips for the selected player.
+
+    Like parse_sheet, a plain def so the blocking sheet read runs off the
+    event loop.
     """
     try:
         player_clips = process_csv(sheet_url, game)
@@ -750,7 +909,7 @@ async def get_clips(
         clips = player_clips[player]
 
         # Create table rows
-        rows = ""
+        rows = []
         for clip in clips:
             bg_class = (
                 "bg-red-50 text-red-800" if not clip.included else "hover:bg-gray-50"
@@ -761,13 +920,15 @@ async def get_clips(
             start_str = format_seconds(clip.start)
             end_str = format_seconds(clip.end)
 
-            rows += f"""
+            rows.append(
+                f"""
             <tr class="border-b {bg_class} {opacity_class} transition-colors">
                 <td class="py-1 px-4 font-mono text-sm">{start_str}</td>
                 <td class="py-1 px-4 font-mono text-sm">{end_str}</td>
                 <td class="py-1 px-4 text-center text-sm text-gray-600">{clip.notes}</td>
             </tr>
             """
+            )
 
         return f"""
         <div class="overflow-x-auto border rounded-lg">
@@ -0,0 +1,11 @@
+import pytest
+
+from highlight_cuts import core
+
+
+@pytest.fixture(autouse=True)
+def clear_sheet_cache():
+    """Keep downloaded sheet CSVs from leaking between tests."""
+    core._SHEET_CACHE.clear()
+    yield
+    core._SHEET_CACHE.clear()
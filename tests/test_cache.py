@@ -2,11 +2,16 @@
 Tests for cache module.
 """
 
+import os
+import subprocess
+import sys
 import tempfile
+import threading
 from pathlib import Path
 
 import pytest
 
+import highlight_cuts
 from highlight_cuts.cache import (
     append_to_cache,
     clear_cache,
@@ -14,6 +19,8 @@ from highlight_cuts.cache import (
     extract_sheet_info,
     get_sheet_title,
     read_cache,
+    _read_cache_lines,
+    _replace_cache_file,
 )
 from unittest.mock import patch, MagicMock
 
@@ -97,6 +104,176 @@ def test_append_and_read_cache():
         assert entries[1]["gid"] == "0"
 
 
+def test_read_cache_reuses_entries_until_file_changes():
+    """Test that read_cache only re-parses the file after it is rewritten."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = Path(tmpdir)
+        url1 = "https://docs.google.com/spreadsheets/d/sheet1/edit"
+        url2 = "https://docs.google.com/spreadsheets/d/sheet2/edit"
+        append_to_cache(output_dir, url1, "Game 1")
+
+        with patch(
+            "highlight_cuts.cache._read_cache_lines", side_effect=_read_cache_lines
+        ) as read:
+            assert len(read_cache(output_dir)) == 1
+            assert len(read_cache(output_dir)) == 1
+            assert read.call_count == 1
+
+            append_to_cache(output_dir, url2, "Game 2")
+            entries = read_cache(output_dir)
+
+        assert [e["sheet_name"] for e in entries] == ["Game 2", "Game 1"]
+
+
+def test_read_cache_sorts_out_of_order_file():
+    """Test that a hand-edited, unsorted cache file is still read newest-first."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = Path(tmpdir)
+        (output_dir / ".sheet_cache.txt").write_text(
+            "100|old|0|https://docs.google.com/spreadsheets/d/old/edit|Old\n"
+            "300|new|0|https://docs.google.com/spreadsheets/d/new/edit|New\n"
+            "200|mid|0|https://docs.google.com/spreadsheets/d/mid/edit|Mid\n"
+        )
+
+        entries = read_cache(output_dir)
+        assert [e["sheet_name"] for e in entries] == ["New", "Mid", "Old"]
+
+
+def test_read_cache_crlf_line_endings():
+    """Test that a cache file saved with Windows line endings reads cleanly."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = Path(tmpdir)
+        (output_dir / ".sheet_cache.txt").write_bytes(
+            b"300|new|0|https://docs.google.com/spreadsheets/d/new/edit|New\r\n"
+            b"100|old|0|https://docs.google.com/spreadsheets/d/old/edit|Old\r\n"
+        )
+
+        entries = read_cache(output_dir)
+        assert [e["sheet_name"] for e in entries] == ["New", "Old"]
+
+
+def test_cache_stores_non_ascii_sheet_name_as_utf8():
+    """Test that the cache file is written and read back as UTF-8."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = Path(tmpdir)
+        name = "Équipe Ünïted – 2024"
+        append_to_cache(
+            output_dir, "https://docs.google.com/spreadsheets/d/abc/edit", name
+        )
+        append_to_cache(
+            output_dir, "https://docs.google.com/spreadsheets/d/def/edit", "Other"
+        )
+
+        content = (output_dir / ".sheet_cache.txt").read_bytes()
+        assert content.count(name.encode("utf-8")) == 1
+        assert name in [e["sheet_name"] for e in read_cache(output_dir)]
+
+
+def test_concurrent_appends_keep_every_entry():
+    """Test that concurrent appends don't overwrite each other's entries."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = Path(tmpdir)
+        urls = [
+            f"https://docs.google.com/spreadsheets/d/sheet{i}/edit" for i in range(10)
+        ]
+
+        threads = [
+            threading.Thread(target=append_to_cache, args=(output_dir, url, "Game"))
+            for url in urls
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        entries = read_cache(output_dir)
+        assert sorted(e["original_url"] for e in entries) == sorted(urls)
+        assert list(output_dir.glob("*.tmp")) == []
+        assert not (output_dir / ".sheet_cache.txt.lock").exists()
+
+
+def test_append_to_cache_removes_stale_lock():
+    """Test that a lock file left by a crashed writer doesn't block appends."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = Path(tmpdir)
+        lock_file = output_dir / ".sheet_cache.txt.lock"
+        lock_file.touch()
+        os.utime(lock_file, (0, 0))
+
+        append_to_cache(
+            output_dir, "https://docs.google.com/spreadsheets/d/abc/edit", "Game"
+        )
+
+        assert len(read_cache(output_dir)) == 1
+        assert not lock_file.exists()
+        assert list(output_dir.iterdir()) == [output_dir / ".sheet_cache.txt"]
+
+
+def test_appends_from_two_processes_keep_every_entry():
+    """Test that two processes contending for the cache lock both get in."""
+    script = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from highlight_cuts.cache import append_to_cache\n"
+        "for i in range(10):\n"
+        "    append_to_cache(Path(sys.argv[1]), "
+        "f'https://docs.google.com/spreadsheets/d/{sys.argv[2]}{i}/edit', 'Game')\n"
+    )
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(Path(highlight_cuts.__file__).parents[1]),
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        procs = [
+            subprocess.Popen([sys.executable, "-c", script, tmpdir, name], env=env)
+            for name in ("first", "second")
+        ]
+        assert [proc.wait(timeout=60) for proc in procs] == [0, 0]
+
+        entries = read_cache(Path(tmpdir))
+        assert len(entries) == 20
+        assert list(Path(tmpdir).iterdir()) == [Path(tmpdir) / ".sheet_cache.txt"]
+
+
+def test_append_to_cache_keeps_file_mode():
+    """Test that rewriting the cache keeps the file's permissions."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = Path(tmpdir)
+        cache_file = output_dir / ".sheet_cache.txt"
+        cache_file.touch()
+        cache_file.chmod(0o640)
+
+        append_to_cache(
+            output_dir, "https://docs.google.com/spreadsheets/d/abc/edit", "Game"
+        )
+
+        assert cache_file.stat().st_mode & 0o777 == 0o640
+
+
+def test_new_cache_file_uses_umask_mode():
+    """Test that a new cache file isn't restricted to its owner."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_file = Path(tmpdir) / ".sheet_cache.txt"
+        old_umask = os.umask(0o022)
+        try:
+            _replace_cache_file(cache_file, ["line"])
+        finally:
+            os.umask(old_umask)
+
+        assert cache_file.stat().st_mode & 0o777 == 0o644
+
+
+def test_replace_cache_file_removes_temp_file_on_failure():
+    """Test that a failed rewrite leaves no temp file behind."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_file = Path(tmpdir) / ".sheet_cache.txt"
+        with patch("highlight_cuts.cache.os.replace", side_effect=OSError("disk")):
+            with pytest.raises(OSError):
+                _replace_cache_file(cache_file, ["line"])
+
+        assert list(Path(tmpdir).iterdir()) == []
+
+
 def test_cache_deduplication():
     """Test that duplicate (sheet_id, gid) pairs are deduplicated."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -284,13 +461,15 @@ def test_cache_file_format():
         assert parts[4] == "Test Game"
 
 
-@patch("highlight_cuts.cache.requests.get")
+@patch("highlight_cuts.cache.SESSION.get")
 def test_get_sheet_title_success(mock_get):
     """Test successfully extracting sheet title from HTML."""
     mock_response = MagicMock()
-    mock_response.text = (
-        "<html><head><title>My Game Sheet - Google Sheets</title></head></html>"
-    )
+    mock_response.iter_content.return_value = [
+        b"<html><head><title>My Game Sheet - Google ",
+        b"Sheets</title></head>",
+        b"<body>",
+    ]
     mock_response.raise_for_status = MagicMock()
     mock_get.return_value = mock_response
 
@@ -298,11 +477,13 @@ def test_get_sheet_title_success(mock_get):
     assert title == "My Game Sheet"
 
 
-@patch("highlight_cuts.cache.requests.get")
+@patch("highlight_cuts.cache.SESSION.get")
 def test_get_sheet_title_without_suffix(mock_get):
     """Test extracting title without Google Sheets suffix."""
     mock_response = MagicMock()
-    mock_response.text = "<html><head><title>Tournament Data</title></head></html>"
+    mock_response.iter_content.return_value = [
+        b"<html><head><title>Tournament Data</title></head></html>"
+    ]
     mock_response.raise_for_status = MagicMock()
     mock_get.return_value = mock_response
 
@@ -310,7 +491,28 @@ def test_get_sheet_title_without_suffix(mock_get):
     assert title == "Tournament Data"
 
 
-@patch("highlight_cuts.cache.requests.get")
+@patch("highlight_cuts.cache.SESSION.get")
+def test_get_sheet_title_stops_reading_after_title(mock_get):
+    """Test that the page is streamed only up to the closing title tag."""
+    chunks_read = []
+
+    def iter_content(chunk_size):
+        for chunk in [b"<html><head><title>Finals</title>", b"<body>", b"</body>"]:
+            chunks_read.append(chunk)
+            yield chunk
+
+    mock_response = MagicMock()
+    mock_response.iter_content.side_effect = iter_content
+    mock_get.return_value = mock_response
+
+    title = get_sheet_title("https://docs.google.com/spreadsheets/d/abc/edit")
+    assert title == "Finals"
+    assert len(chunks_read) == 1
+    assert mock_get.call_args.kwargs["stream"] is True
+    mock_response.close.assert_called_once()
+
+
+@patch("highlight_cuts.cache.SESSION.get")
 def test_get_sheet_title_network_error(mock_get):
     """Test handling network errors when fetching title."""
     mock_get.side_effect = Exception("Network error")
@@ -75,9 +75,8 @@ def test_cli_dry_run(mock_merge, mock_process, runner, caplog):
 
 @patch("highlight_cuts.cli.process_csv")
 @patch("highlight_cuts.cli.merge_intervals")
-@patch("highlight_cuts.cli.extract_clip")
-@patch("highlight_cuts.cli.concat_clips")
-def test_cli_success(mock_concat, mock_extract, mock_merge, mock_process, runner):
+@patch("highlight_cuts.cli.extract_and_concat")
+def test_cli_success(mock_cut, mock_merge, mock_process, runner):
     mock_process.return_value = {"Player1": [Clip(start=0.0, end=10.0, included=True)]}
     mock_merge.return_value = [(0, 10)]
 
@@ -93,17 +92,46 @@ def test_cli_success(mock_concat, mock_extract, mock_merge, mock_process, runner
         )
 
         assert result.exit_code == 0
-        mock_extract.assert_called()
-        mock_concat.assert_called()
+        mock_cut.assert_called_once()
 
 
 @patch("highlight_cuts.cli.process_csv")
 @patch("highlight_cuts.cli.merge_intervals")
-@patch("highlight_cuts.cli.extract_clip")
-def test_cli_extraction_error(mock_extract, mock_merge, mock_process, runner):
+@patch("highlight_cuts.cli.extract_and_concat")
+def test_cli_cuts_merged_intervals_in_one_call(
+    mock_cut, mock_merge, mock_process, runner
+):
     mock_process.return_value = {"Player1": [Clip(start=0.0, end=10.0, included=True)]}
+    mock_merge.return_value = [(0, 10), (20, 30), (40, 50), (60, 70)]
+
+    with runner.isolated_filesystem():
+        with open("vid.mp4", "w") as f:
+            f.write("video")
+        with open("data.csv", "w") as f:
+            f.write("csv")
+
+        result = runner.invoke(
+            main, ["--input-video", "vid.mp4", "--csv-file", "data.csv", "--game", "G1"]
+        )
+
+        assert result.exit_code == 0
+        mock_cut.assert_called_once_with(
+            "vid.mp4",
+            [(0, 10), (20, 30), (40, 50), (60, 70)],
+            "./vid_Player1.mp4",
+        )
+
+
+@patch("highlight_cuts.cli.process_csv")
+@patch("highlight_cuts.cli.merge_intervals")
+@patch("highlight_cuts.cli.extract_and_concat")
+def test_cli_extraction_error(mock_cut, mock_merge, mock_process, runner):
+    mock_process.return_value = {
+        "Player1": [Clip(start=0.0, end=10.0, included=True)],
+        "Player2": [Clip(start=0.0, end=10.0, included=True)],
+    }
     mock_merge.return_value = [(0, 10)]
-    mock_extract.side_effect = Exception("Extract Error")
+    mock_cut.side_effect = [Exception("Extract Error"), None]
 
     with runner.isolated_filesystem():
         with open("vid.mp4", "w") as f:
@@ -115,14 +143,47 @@ def test_cli_extraction_error(mock_extract, mock_merge, mock_process, runner):
             main, ["--input-video", "vid.mp4", "--csv-file", "data.csv", "--game", "G1"]
         )
 
-        assert result.exit_code != 0
+        # The failure is logged and the next player is still cut
+        assert result.exit_code == 0
+        assert mock_cut.call_count == 2
+        assert mock_cut.call_args[0][2].endswith("vid_Player2.mp4")
+
+
+@pytest.mark.parametrize(
+    "player, expected",
+    [
+        ("O'Brien, Jr.", "vid_OBrien_Jr.mp4"),
+        (" Mary-Kate #7 ", "vid_Mary-Kate_7.mp4"),
+        ("José ✓", "vid_José.mp4"),
+    ],
+)
+@patch("highlight_cuts.cli.process_csv")
+@patch("highlight_cuts.cli.merge_intervals")
+@patch("highlight_cuts.cli.extract_and_concat")
+def test_cli_sanitizes_player_name(
+    mock_cut, mock_merge, mock_process, runner, player, expected
+):
+    mock_process.return_value = {player: [Clip(start=0.0, end=10.0, included=True)]}
+    mock_merge.return_value = [(0, 10)]
+
+    with runner.isolated_filesystem():
+        with open("vid.mp4", "w") as f:
+            f.write("video")
+        with open("data.csv", "w") as f:
+            f.write("csv")
+
+        result = runner.invoke(
+            main, ["--input-video", "vid.mp4", "--csv-file", "data.csv", "--game", "G1"]
+        )
+
+        assert result.exit_code == 0
+        assert mock_cut.call_args[0][2].endswith(expected)
 
 
 @patch("highlight_cuts.cli.process_csv")
 @patch("highlight_cuts.cli.merge_intervals")
-@patch("highlight_cuts.cli.extract_clip")
-@patch("highlight_cuts.cli.concat_clips")
-def test_cli_output_dir(mock_concat, mock_extract, mock_merge, mock_process, runner):
+@patch("highlight_cuts.cli.extract_and_concat")
+def test_cli_output_dir(mock_cut, mock_merge, mock_process, runner):
     """Test that --output-dir creates files in the specified directory."""
     mock_process.return_value = {"Player1": [Clip(start=0.0, end=10.0, included=True)]}
     mock_merge.return_value = [(0, 10)]
@@ -148,20 +209,17 @@ def test_cli_output_dir(mock_concat, mock_extract, mock_merge, mock_process, run
         )
 
         assert result.exit_code == 0
-        # Verify concat_clips was called with the output directory path
-        call_args = mock_concat.call_args
+        # Verify extract_and_concat was called with the output directory path
+        call_args = mock_cut.call_args
         assert call_args is not None
-        output_path = call_args[0][1]  # Second argument to concat_clips
+        output_path = call_args[0][2]  # Third argument to extract_and_concat
         assert output_path.startswith("output/") or output_path.startswith("output\\")
 
 
 @patch("highlight_cuts.cli.process_csv")
 @patch("highlight_cuts.cli.merge_intervals")
-@patch("highlight_cuts.cli.extract_clip")
-@patch("highlight_cuts.cli.concat_clips")
-def test_cli_output_dir_created(
-    mock_concat, mock_extract, mock_merge, mock_process, runner
-):
+@patch("highlight_cuts.cli.extract_and_concat")
+def test_cli_output_dir_created(mock_cut, mock_merge, mock_process, runner):
     """Test that --output-dir creates the directory if it doesn't exist."""
     import os
 
@@ -199,11 +257,8 @@ def test_cli_output_dir_created(
 
 @patch("highlight_cuts.cli.process_csv")
 @patch("highlight_cuts.cli.merge_intervals")
-@patch("highlight_cuts.cli.extract_clip")
-@patch("highlight_cuts.cli.concat_clips")
-def test_cli_default_output_dir(
-    mock_concat, mock_extract, mock_merge, mock_process, runner
-):
+@patch("highlight_cuts.cli.extract_and_concat")
+def test_cli_default_output_dir(mock_cut, mock_merge, mock_process, runner):
     """Test that without --output-dir, files are created in current directory."""
     mock_process.return_value = {"Player1": [Clip(start=0.0, end=10.0, included=True)]}
     mock_merge.return_value = [(0, 10)]
@@ -219,9 +274,9 @@ def test_cli_default_output_dir(
         )
 
         assert result.exit_code == 0
-        # Verify concat_clips was called with current directory path
-        call_args = mock_concat.call_args
+        # Verify extract_and_concat was called with current directory path
+        call_args = mock_cut.call_args
         assert call_args is not None
-        output_path = call_args[0][1]
+        output_path = call_args[0][2]
         # Should be in current directory (starts with ./ or just filename)
         assert not output_path.startswith("/") or output_path.startswith("./")
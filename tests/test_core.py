@@ -2,6 +2,7 @@ import pytest
 from highlight_cuts.core import merge_intervals, process_csv
 import tempfile
 import os
+from unittest.mock import MagicMock, patch
 
 
 def test_merge_intervals_no_overlap():
@@ -37,6 +38,28 @@ def test_merge_intervals_padding_overlap():
     assert merged == [(9.0, 31.0)]
 
 
+def test_merge_intervals_unsorted():
+    intervals = [(20, 30), (0, 10), (8, 12)]
+    merged = merge_intervals(intervals)
+    assert merged == [(0, 12), (20, 30)]
+
+
+def test_merge_intervals_large_input_matches_small_path():
+    # Enough intervals to take the NumPy path, including duplicates,
+    # touching intervals and a start clamped at zero
+    intervals = [(float(i * 7 % 300), float(i * 7 % 300 + i % 5)) for i in range(200)]
+    intervals += [(0.5, 2.0), (40.0, 40.0), (40.0, 45.0)]
+
+    expected = []
+    for start, end in sorted((max(0.0, s - 1.0), e + 1.0) for s, e in intervals):
+        if expected and start <= expected[-1][1]:
+            expected[-1] = (expected[-1][0], max(expected[-1][1], end))
+        else:
+            expected.append((start, end))
+
+    assert merge_intervals(intervals, padding=1.0) == expected
+
+
 def test_process_csv():
     csv_content = """videoName,startTime,stopTime,playerName,notes,include
 game1,00:01:00,00:01:10,PlayerA,,true
@@ -71,6 +94,24 @@ game2,00:05:00,00:05:10,PlayerA,,
         os.remove(csv_path)
 
 
+def test_process_csv_reads_values_as_text():
+    csv_content = """videoName,startTime,stopTime,playerName,notes,include,extra
+game1,00:10,00:20,23,5,1,ignored
+"""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(csv_content)
+        csv_path = f.name
+
+    try:
+        clips = process_csv(csv_path, "game1")
+        # Numeric-looking player names and notes are not converted to numbers
+        assert list(clips) == ["23"]
+        assert clips["23"][0].notes == "5"
+        assert clips["23"][0].included is True
+    finally:
+        os.remove(csv_path)
+
+
 def test_process_csv_missing_columns():
     with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
         f.write("col1,col2\n1,2")
@@ -88,6 +129,23 @@ def test_process_csv_invalid_file():
         process_csv("non_existent.csv", "game")
 
 
+def test_process_csv_invalid_include():
+    csv_content = """videoName,startTime,stopTime,playerName,include
+game,00:10,00:20,p1, Yes
+game,00:30,00:40,p1,maybe
+game,00:50,00:55,p1,maybe
+"""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(csv_content)
+        csv_path = f.name
+
+    try:
+        with pytest.raises(ValueError, match="Invalid value for 'include': maybe$"):
+            process_csv(csv_path, "game")
+    finally:
+        os.remove(csv_path)
+
+
 def test_process_csv_bad_timestamps():
     csv_content = "videoName,startTime,stopTime,playerName\ngame,bad,time,p1"
     with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
@@ -149,6 +207,16 @@ class TestNormalizeSheetsUrl:
         )
         assert normalize_sheets_url(input_url) == expected
 
+    def test_normalize_memoizes_repeated_urls(self):
+        """Test that repeated URLs are served from the cache."""
+        from highlight_cuts.core import normalize_sheets_url
+
+        normalize_sheets_url.cache_clear()
+        input_url = "https://docs.google.com/spreadsheets/d/ABC123/edit#gid=456"
+        first = normalize_sheets_url(input_url)
+        assert normalize_sheets_url(input_url) == first
+        assert normalize_sheets_url.cache_info().hits == 1
+
     def test_normalize_local_file_path(self):
         """Test that local file paths pass through unchanged."""
         from highlight_cuts.core import normalize_sheets_url
@@ -179,6 +247,68 @@ class TestNormalizeSheetsUrl:
         assert normalize_sheets_url(input_url) == expected
 
 
+class TestSheetCsvCache:
+    """Tests for the in-process Google Sheets CSV download cache."""
+
+    URL = "https://docs.google.com/spreadsheets/d/ABC123/gviz/tq?tqx=out:csv&gid=0"
+    CSV = b"videoName,startTime,stopTime,playerName\ngame1,00:01,00:05,PlayerA\n"
+
+    def _response(self, status_code=200, content=b"", headers=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.content = content
+        response.headers = headers or {}
+        return response
+
+    @patch("highlight_cuts._http.SESSION.get")
+    def test_repeated_reads_download_once(self, mock_get):
+        """Test that a second read within the TTL reuses the download."""
+        mock_get.return_value = self._response(content=self.CSV)
+
+        first = process_csv(self.URL, "game1")
+        second = process_csv(self.URL, "game1")
+
+        assert mock_get.call_count == 1
+        assert first == second
+        assert first["PlayerA"][0].end == 5.0
+
+    @patch("highlight_cuts._http.SESSION.get")
+    def test_expired_entry_revalidates_with_etag(self, mock_get):
+        """Test that an expired entry is revalidated and reused on 304."""
+        from highlight_cuts import core
+
+        mock_get.return_value = self._response(
+            content=self.CSV, headers={"ETag": '"v1"'}
+        )
+        assert core._fetch_sheet_csv(self.URL) == self.CSV
+
+        # Age the entry past the TTL
+        fetched_at, content, validators = core._SHEET_CACHE[self.URL]
+        core._SHEET_CACHE[self.URL] = (
+            fetched_at - core.SHEET_CACHE_TTL - 1,
+            content,
+            validators,
+        )
+
+        mock_get.return_value = self._response(status_code=304)
+        assert core._fetch_sheet_csv(self.URL) == self.CSV
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    @patch("highlight_cuts._http.SESSION.get")
+    def test_expired_entry_replaced_when_modified(self, mock_get):
+        """Test that a changed sheet replaces the cached CSV."""
+        from highlight_cuts import core
+
+        mock_get.return_value = self._response(content=self.CSV)
+        core._fetch_sheet_csv(self.URL)
+        core._SHEET_CACHE[self.URL] = (-1e9, self.CSV, {})
+
+        updated = self.CSV + b"game1,00:10,00:20,PlayerB\n"
+        mock_get.return_value = self._response(content=updated)
+        assert core._fetch_sheet_csv(self.URL) == updated
+        assert core._SHEET_CACHE[self.URL][1] == updated
+
+
 @pytest.mark.integration
 class TestGoogleSheetsIntegration:
     """Integration tests for Google Sheets URL support."""
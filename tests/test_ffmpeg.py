@@ -2,7 +2,12 @@ import subprocess
 import os
 import pytest
 from unittest.mock import patch, MagicMock
-from highlight_cuts.ffmpeg import extract_clip, concat_clips
+from highlight_cuts.ffmpeg import (
+    extract_clip,
+    concat_clips,
+    extract_and_concat,
+    extract_clips_parallel,
+)
 
 
 @patch("subprocess.run")
@@ -27,6 +32,16 @@ def test_extract_clip_success(mock_run):
     mock_run.assert_called_once_with(expected_cmd, check=True, capture_output=True)
 
 
+@patch("subprocess.run")
+def test_extract_clip_returns_raw_output(mock_run):
+    mock_run.return_value = MagicMock(stdout=b"out", stderr=b"frame=1")
+
+    result = extract_clip("input.mp4", 0.0, 1.0, "output.mp4")
+
+    assert result["stdout"] == b"out"
+    assert result["stderr"] == b"frame=1"
+
+
 @patch("subprocess.run")
 def test_extract_clip_failure(mock_run):
     mock_run.side_effect = subprocess.CalledProcessError(1, "cmd", stderr=b"Error")
@@ -35,6 +50,25 @@ def test_extract_clip_failure(mock_run):
         extract_clip("input.mp4", 10.0, 20.0, "output.mp4")
 
 
+@patch("highlight_cuts.ffmpeg.extract_clip")
+def test_extract_clips_parallel_keeps_order(mock_extract):
+    mock_extract.side_effect = lambda src, start, end, out: {"out": out}
+    specs = [(float(i), float(i + 1), f"clip_{i}.mp4") for i in range(10)]
+
+    results = extract_clips_parallel("input.mp4", specs, max_workers=4)
+
+    assert [r["out"] for r in results] == [out for _, _, out in specs]
+    assert mock_extract.call_count == 10
+
+
+@patch("highlight_cuts.ffmpeg.extract_clip")
+def test_extract_clips_parallel_failure(mock_extract):
+    mock_extract.side_effect = subprocess.CalledProcessError(1, "cmd", stderr=b"Error")
+
+    with pytest.raises(subprocess.CalledProcessError):
+        extract_clips_parallel("input.mp4", [(0.0, 1.0, "a.mp4"), (2.0, 3.0, "b.mp4")])
+
+
 @patch("subprocess.run")
 def test_concat_clips_success(mock_run):
     clips = ["clip1.mp4", "clip2.mp4"]
@@ -66,6 +100,85 @@ def test_concat_clips_success(mock_run):
         mock_run.assert_called_once_with(expected_cmd, check=True, capture_output=True)
 
 
+@patch("subprocess.run")
+def test_concat_clips_writes_absolute_paths(mock_run, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output = str(tmp_path / "final.mp4")
+    absolute = str(tmp_path / "clips" / "c2.mp4")
+    list_contents = []
+
+    def run(cmd, **kwargs):
+        with open(output + ".txt") as f:
+            list_contents.append(f.read())
+        return MagicMock(stdout=b"", stderr=b"")
+
+    mock_run.side_effect = run
+
+    concat_clips(["c1.mp4", absolute], output)
+
+    assert list_contents == [f"file '{tmp_path / 'c1.mp4'}'\nfile '{absolute}'\n"]
+    assert not os.path.exists(output + ".txt")
+
+
+@patch("subprocess.run")
+def test_extract_and_concat_writes_inpoints(mock_run, tmp_path):
+    source = tmp_path / "O'Neil game.mp4"
+    output = str(tmp_path / "final.mp4")
+    list_contents = []
+
+    def run(cmd, **kwargs):
+        # The list file is removed afterwards, so read it while ffmpeg "runs"
+        with open(output + ".txt") as f:
+            list_contents.append(f.read())
+        return MagicMock(stdout=b"", stderr=b"")
+
+    mock_run.side_effect = run
+
+    extract_and_concat(str(source), [(1.0, 2.5), (10.0, 12.0)], output)
+
+    quoted = str(source).replace("'", "'\\''")
+    assert list_contents == [
+        f"file '{quoted}'\ninpoint 1.000\noutpoint 2.500\n"
+        f"file '{quoted}'\ninpoint 10.000\noutpoint 12.000\n"
+    ]
+    cmd = mock_run.call_args[0][0]
+    assert cmd[:8] == [
+        "ffmpeg",
+        "-y",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        output + ".txt",
+    ]
+    assert cmd[-1] == output
+    assert not os.path.exists(output + ".txt")
+
+
+@pytest.mark.parametrize(
+    "output, faststart",
+    [("final.mp4", True), ("final.MOV", True), ("final.mkv", False)],
+)
+@patch("subprocess.run")
+def test_extract_and_concat_faststart_only_for_mp4_and_mov(
+    mock_run, tmp_path, output, faststart
+):
+    output = str(tmp_path / output)
+
+    extract_and_concat("input.mp4", [(0.0, 1.0)], output)
+
+    cmd = mock_run.call_args[0][0]
+    assert ("+faststart" in cmd) == faststart
+    assert cmd[-1] == output
+
+
+@patch("subprocess.run")
+def test_extract_and_concat_empty(mock_run):
+    extract_and_concat("input.mp4", [], "out.mp4")
+    mock_run.assert_not_called()
+
+
 @patch("subprocess.run")
 def test_concat_clips_empty(mock_run):
     concat_clips([], "out.mp4")
@@ -11,7 +11,7 @@ from highlight_cuts.core import Clip
 
 @patch("highlight_cuts.web.generate_hls")
 @patch("highlight_cuts.web.concat_clips")
-@patch("highlight_cuts.web.extract_clip")
+@patch("highlight_cuts.ffmpeg.extract_clip")
 @patch("highlight_cuts.web.merge_intervals")
 @patch("highlight_cuts.web.process_csv")
 def test_old_mp4_files_deleted(
@@ -68,7 +68,7 @@ def test_old_mp4_files_deleted(
 
 @patch("highlight_cuts.web.generate_hls")
 @patch("highlight_cuts.web.concat_clips")
-@patch("highlight_cuts.web.extract_clip")
+@patch("highlight_cuts.ffmpeg.extract_clip")
 @patch("highlight_cuts.web.merge_intervals")
 @patch("highlight_cuts.web.process_csv")
 def test_old_mov_files_deleted(
@@ -125,7 +125,7 @@ def test_old_mov_files_deleted(
 
 @patch("highlight_cuts.web.generate_hls")
 @patch("highlight_cuts.web.concat_clips")
-@patch("highlight_cuts.web.extract_clip")
+@patch("highlight_cuts.ffmpeg.extract_clip")
 @patch("highlight_cuts.web.merge_intervals")
 @patch("highlight_cuts.web.process_csv")
 def test_old_files_different_extensions_not_deleted(
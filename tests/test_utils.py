@@ -1,5 +1,6 @@
+import pandas as pd
 import pytest
-from highlight_cuts.utils import parse_time
+from highlight_cuts.utils import parse_time, parse_times
 
 
 def test_parse_time_hh_mm_ss():
@@ -21,3 +22,32 @@ def test_parse_time_invalid():
 
 def test_parse_time_floats():
     assert parse_time("00:00:01.5") == 1.5
+
+
+def test_parse_time_memoizes_repeated_values():
+    parse_time.cache_clear()
+    assert parse_time("00:02:30") == 150.0
+    assert parse_time("00:02:30") == 150.0
+    assert parse_time.cache_info().hits == 1
+
+    # Failures are not cached and raise every time
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            parse_time("2:30:xx")
+
+
+def test_parse_times_matches_parse_time():
+    values = ["01:01:01", "1:00:00", "01:01", "10:30", "00:00:01.5", "90:00"]
+    times = pd.Series(values, index=[5, 6, 7, 8, 9, 10])
+
+    result = parse_times(times)
+
+    assert result.index.equals(times.index)
+    assert result.tolist() == [parse_time(v) for v in values]
+
+
+def test_parse_times_invalid():
+    with pytest.raises(ValueError):
+        parse_times(pd.Series(["00:01:00", "00:0a:00"]))
+    with pytest.raises(ValueError):
+        parse_times(pd.Series(["01:01", "01:01:01:01"]))
@@ -19,12 +19,12 @@ def test_read_root(mock_get_structure):
 
 
 @patch("highlight_cuts.web.process_csv")
-@patch("requests.get")
+@patch("highlight_cuts._http.SESSION.get")
 def test_parse_sheet(mock_get, mock_process_csv):
     # Mock requests.get to return a CSV string
     mock_response = MagicMock()
-    mock_response.text = (
-        "videoName,playerName,startTime,stopTime,notes\nGame1,Player1,00:00,00:10,note"
+    mock_response.content = (
+        b"videoName,playerName,startTime,stopTime,notes\nGame1,Player1,00:00,00:10,note"
     )
     mock_get.return_value = mock_response
 
@@ -40,10 +40,10 @@ def test_parse_sheet(mock_get, mock_process_csv):
 
 
 @patch("highlight_cuts.web.process_csv")
-@patch("highlight_cuts.web.extract_clip")
+@patch("highlight_cuts.ffmpeg.extract_clip")
 @patch("highlight_cuts.web.concat_clips")
-@patch("highlight_cuts.web.BackgroundTasks.add_task")
-def test_process_endpoint(mock_add_task, mock_concat, mock_extract, mock_process):
+@patch("highlight_cuts.web.JOB_EXECUTOR")
+def test_process_endpoint(mock_executor, mock_concat, mock_extract, mock_process):
     # Mock return value with Clip objects
     mock_process.return_value = {"Player1": [Clip(start=0.0, end=10.0, included=True)]}
     mock_extract.return_value = {"command": "cmd", "stdout": "", "stderr": ""}
@@ -66,10 +66,10 @@ def test_process_endpoint(mock_add_task, mock_concat, mock_extract, mock_process
     assert 'hx-get="/status-check"' in response.text
     assert 'hx-trigger="load"' in response.text
 
-    # Verify that add_task was called with correct arguments
+    # Verify that the job was submitted with correct arguments
     # This test would have caught the missing 'game' parameter bug
-    mock_add_task.assert_called_once()
-    call_args = mock_add_task.call_args
+    mock_executor.submit.assert_called_once()
+    call_args = mock_executor.submit.call_args
     assert call_args[0][0].__name__ == "process_video_task"
     # Verify all 5 required arguments are passed: video_filename, sheet_url, game, player, output_filename
     assert len(call_args[0]) == 6  # function + 5 args
@@ -189,13 +189,13 @@ def test_root_with_cached_sheets(mock_read_cache, mock_get_structure):
 
 
 @patch("highlight_cuts.web.append_to_cache")
-@patch("requests.get")
+@patch("highlight_cuts._http.SESSION.get")
 def test_parse_sheet_updates_cache(mock_requests_get, mock_append_cache):
     """Test that parse_sheet adds to cache after successful parse."""
     # Mock the CSV response
     mock_response = MagicMock()
-    mock_response.text = (
-        "videoName,playerName,startTime,stopTime,notes\nGame1,Player1,00:00,00:10,note"
+    mock_response.content = (
+        b"videoName,playerName,startTime,stopTime,notes\nGame1,Player1,00:00,00:10,note"
     )
     mock_requests_get.return_value = mock_response
 
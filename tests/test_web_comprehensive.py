@@ -11,6 +11,7 @@ from highlight_cuts.web import (
     app,
     get_video_structure,
     format_seconds,
+    time_ago,
     process_video_task,
     NoCacheStaticFiles,
     enforce_output_limits,
@@ -198,6 +199,23 @@ class TestGetVideoStructure:
             assert game["stream_url"] == "https://example.com/stream"
             assert game["title"] == "Cool Game"
 
+    def test_metadata_parsed_once_until_rewritten(self):
+        """Test that games.yaml is reparsed only after it changes."""
+        from highlight_cuts.web import _load_metadata
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            team_dir = Path(tmpdir)
+            metadata_file = team_dir / "games.yaml"
+            metadata_file.write_text("games:\n  game1:\n    title: Cool Game\n")
+
+            assert _load_metadata(team_dir) == {"game1": {"title": "Cool Game"}}
+            with patch("highlight_cuts.web.yaml.load") as mock_load:
+                assert _load_metadata(team_dir) == {"game1": {"title": "Cool Game"}}
+                mock_load.assert_not_called()
+
+            metadata_file.write_text("games:\n  game1:\n    title: Renamed Game\n")
+            assert _load_metadata(team_dir) == {"game1": {"title": "Renamed Game"}}
+
     def test_metadata_yml_enrichment(self):
         """Test that games.yml also enriches stream_url and title."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -244,15 +262,56 @@ class TestGetVideoStructure:
                 assert "Team" in structure
                 assert "Tournament" in structure["Team"]
 
+    def test_reuses_scan_until_library_changes(self):
+        """Test that repeat calls skip the directory walk until a game is added."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tournament_dir = Path(tmpdir) / "TeamA" / "Tournament1"
+            tournament_dir.mkdir(parents=True)
+            (tournament_dir / "game1.mp4").touch()
+
+            with patch("highlight_cuts.web.DATA_DIR", Path(tmpdir)):
+                first = get_video_structure()
+                with patch("highlight_cuts.web._walk_files") as mock_walk:
+                    assert get_video_structure() == first
+                    mock_walk.assert_not_called()
+
+                (tournament_dir / "game2.mp4").touch()
+                structure = get_video_structure()
+                assert len(structure["TeamA"]["Tournament1"]) == 2
+
 
 class TestParseSheetEndpoint:
     """Test parse-sheet endpoint edge cases."""
 
-    @patch("requests.get")
+    @patch("highlight_cuts._http.SESSION.get")
+    def test_reparse_refreshes_sheet_used_for_clips(self, mock_get):
+        """Test that clips come from the rows the latest parse showed."""
+        from highlight_cuts.core import process_csv
+
+        url = "https://docs.google.com/spreadsheets/d/123"
+        header = b"videoName,playerName,startTime,stopTime\n"
+        mock_get.return_value = MagicMock(
+            status_code=200, headers={}, content=header + b"Game1,Player1,00:10,00:20\n"
+        )
+        client.post("/parse-sheet", data={"sheet_url": url})
+        assert process_csv(url, "Game1")["Player1"][0].start == 10.0
+
+        # The sheet is edited and parsed again within the cache TTL
+        mock_get.return_value = MagicMock(
+            status_code=200, headers={}, content=header + b"Game1,Player2,00:30,00:40\n"
+        )
+        response = client.post("/parse-sheet", data={"sheet_url": url})
+        assert "Player2" in response.text
+
+        clips = process_csv(url, "Game1")
+        assert list(clips) == ["Player2"]
+        assert clips["Player2"][0].start == 30.0
+
+    @patch("highlight_cuts._http.SESSION.get")
     def test_parse_sheet_missing_columns(self, mock_get):
         """Test parse-sheet with invalid CSV missing required columns."""
         mock_response = MagicMock()
-        mock_response.text = "col1,col2\nval1,val2"
+        mock_response.content = b"col1,col2\nval1,val2"
         mock_get.return_value = mock_response
 
         response = client.post(
@@ -264,7 +323,7 @@ class TestParseSheetEndpoint:
         assert "Invalid CSV" in response.text
         assert "Missing videoName or playerName columns" in response.text
 
-    @patch("requests.get")
+    @patch("highlight_cuts._http.SESSION.get")
     def test_parse_sheet_request_error(self, mock_get):
         """Test parse-sheet with network error."""
         mock_get.side_effect = Exception("Network error")
@@ -278,11 +337,11 @@ class TestParseSheetEndpoint:
         assert "Error:" in response.text
         assert "Network error" in response.text
 
-    @patch("requests.get")
+    @patch("highlight_cuts._http.SESSION.get")
     def test_parse_sheet_multiple_games_and_players(self, mock_get):
         """Test parse-sheet with multiple games and players."""
         mock_response = MagicMock()
-        mock_response.text = """videoName,playerName,startTime,stopTime
+        mock_response.content = b"""videoName,playerName,startTime,stopTime
 Game1,Player1,00:00,00:10
 Game1,Player1,00:20,00:30
 Game1,Player2,00:05,00:15
@@ -303,6 +362,25 @@ Game2,Player1,00:00,00:10"""
         # Player1 in Game1 has 2 clips, but appears once in table
         assert "Player1" in response.text
 
+    def test_parse_sheet_skips_na_values(self):
+        """Test that parse-sheet skips players pandas reads as missing."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write("videoName,playerName,startTime,stopTime\n")
+            f.write("Game1,Player1,00:00,00:10\n")
+            f.write("Game1,NA,00:20,00:30\n")
+            f.write("null,Player2,00:40,00:50\n")
+            csv_path = f.name
+
+        try:
+            response = client.post("/parse-sheet", data={"sheet_url": csv_path})
+
+            assert response.status_code == 200
+            assert "Player1" in response.text
+            assert "'NA'" not in response.text
+            assert "Player2" not in response.text
+        finally:
+            os.unlink(csv_path)
+
     def test_parse_sheet_local_csv_file(self):
         """Test parse-sheet with local CSV file path."""
         with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
@@ -325,7 +403,7 @@ class TestProcessVideoTask:
     """Test the background processing task."""
 
     @patch("highlight_cuts.web.concat_clips")
-    @patch("highlight_cuts.web.extract_clip")
+    @patch("highlight_cuts.ffmpeg.extract_clip")
     @patch("highlight_cuts.web.process_csv")
     @patch("highlight_cuts.web.glob.glob")
     def test_process_video_task_deletes_old_files(
@@ -379,7 +457,7 @@ class TestProcessVideoTask:
                     assert not old_file1.exists()
 
     @patch("highlight_cuts.web.concat_clips")
-    @patch("highlight_cuts.web.extract_clip")
+    @patch("highlight_cuts.ffmpeg.extract_clip")
     @patch("highlight_cuts.web.process_csv")
     @patch("highlight_cuts.web.glob.glob")
     @patch("highlight_cuts.web.os.remove")
@@ -476,7 +554,7 @@ class TestProcessVideoTask:
                     )
 
     @patch("highlight_cuts.web.concat_clips")
-    @patch("highlight_cuts.web.extract_clip")
+    @patch("highlight_cuts.ffmpeg.extract_clip")
     @patch("highlight_cuts.web.process_csv")
     @patch("highlight_cuts.web.merge_intervals")
     def test_process_video_task_writes_completion_flag(
@@ -518,7 +596,7 @@ class TestProcessVideoTask:
                     assert "Player1|Game1|" in content
 
     @patch("highlight_cuts.web.concat_clips")
-    @patch("highlight_cuts.web.extract_clip")
+    @patch("highlight_cuts.ffmpeg.extract_clip")
     @patch("highlight_cuts.web.process_csv")
     @patch("highlight_cuts.web.merge_intervals")
     def test_process_video_task_writes_debug_log(
@@ -536,13 +614,13 @@ class TestProcessVideoTask:
                     mock_merge.return_value = [(5.0, 15.0)]
                     mock_extract.return_value = {
                         "command": "ffmpeg ...",
-                        "stdout": "extract stdout",
-                        "stderr": "extract stderr",
+                        "stdout": b"extract stdout",
+                        "stderr": b"extract stderr",
                     }
                     mock_concat.return_value = {
                         "command": "ffmpeg concat",
-                        "stdout": "concat stdout",
-                        "stderr": "concat stderr",
+                        "stdout": b"concat stdout",
+                        "stderr": b"concat stderr",
                     }
 
                     process_video_task(
@@ -562,7 +640,8 @@ class TestProcessVideoTask:
                     assert "Game1" in content
                     assert "Player1" in content
                     assert "ffmpeg ..." in content
-                    assert "extract stdout" in content
+                    assert "Stdout: extract stdout" in content
+                    assert "Stderr: concat stderr" in content
 
     @patch("highlight_cuts.web.process_csv")
     def test_process_video_task_exception_handling(self, mock_process_csv):
@@ -585,8 +664,8 @@ class TestProcessVideoTask:
 class TestProcessEndpoint:
     """Test /process endpoint edge cases."""
 
-    @patch("highlight_cuts.web.BackgroundTasks.add_task")
-    def test_process_with_short_path(self, mock_add_task):
+    @patch("highlight_cuts.web.JOB_EXECUTOR.submit")
+    def test_process_with_short_path(self, mock_submit):
         """Test process endpoint with video path shorter than expected."""
         response = client.post(
             "/process",
@@ -602,13 +681,13 @@ class TestProcessEndpoint:
         assert "Processing" in response.text
 
         # Verify fallback values were used
-        call_args = mock_add_task.call_args[0]
+        call_args = mock_submit.call_args[0]
         output_filename = call_args[5]
         assert "UnknownTeam" in output_filename
         assert "UnknownTournament" in output_filename
 
-    @patch("highlight_cuts.web.BackgroundTasks.add_task")
-    def test_process_sanitizes_special_characters(self, mock_add_task):
+    @patch("highlight_cuts.web.JOB_EXECUTOR.submit")
+    def test_process_sanitizes_special_characters(self, mock_submit):
         """Test that special characters in names are sanitized."""
         response = client.post(
             "/process",
@@ -622,7 +701,7 @@ class TestProcessEndpoint:
 
         assert response.status_code == 200
 
-        call_args = mock_add_task.call_args[0]
+        call_args = mock_submit.call_args[0]
         output_filename = call_args[5]
 
         # Special characters should be removed
@@ -871,6 +950,42 @@ class TestRetentionLimits:
             remaining = list(base.rglob("*.mp4"))
             assert len(remaining) == 2
 
+    def test_enforce_limits_ignores_uppercase_extensions(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            player_dir = base / "PlayerA"
+            player_dir.mkdir()
+            kept = player_dir / "game_20240101_000000.mp4"
+            foreign = player_dir / "game_20230101_000000.MP4"
+            kept.touch()
+            foreign.touch()
+            old_time = (datetime.now() - timedelta(days=1)).timestamp()
+            os.utime(foreign, (old_time, old_time))
+
+            enforce_output_limits(base, max_total=1, max_per_player_game=1)
+
+            # Only the lowercase names the app writes are managed, as before
+            assert kept.exists()
+            assert foreign.exists()
+
+
+class TestTimeAgo:
+    """Test time_ago helper function."""
+
+    def test_time_ago_units(self):
+        """Test each unit and its singular form."""
+        now = 1_700_000_000.0
+        assert time_ago(now - 30, now) == "Just now"
+        assert time_ago(now - 60, now) == "1 minute ago"
+        assert time_ago(now - 5 * 60, now) == "5 minutes ago"
+        assert time_ago(now - 3 * 3600, now) == "3 hours ago"
+        assert time_ago(now - 86400, now) == "1 day ago"
+        assert time_ago(now - 2 * 86400 - 5, now) == "2 days ago"
+
+    def test_time_ago_future_timestamp(self):
+        """Test that timestamps after now read as just now."""
+        assert time_ago(1_000.0, 900.0) == "Just now"
+
 
 class TestFormatSeconds:
     """Test format_seconds helper function."""
@@ -947,17 +1062,17 @@ class TestIntegrationScenarios:
     """Test complex integration scenarios."""
 
     @patch("highlight_cuts.web.concat_clips")
-    @patch("highlight_cuts.web.extract_clip")
+    @patch("highlight_cuts.ffmpeg.extract_clip")
     @patch("highlight_cuts.web.process_csv")
     @patch("highlight_cuts.web.merge_intervals")
-    @patch("requests.get")
+    @patch("highlight_cuts._http.SESSION.get")
     def test_full_workflow_sheet_to_video(
         self, mock_requests, mock_merge, mock_process_csv, mock_extract, mock_concat
     ):
         """Test complete workflow from parsing sheet to processing video."""
         # Step 1: Parse sheet
         mock_response = MagicMock()
-        mock_response.text = """videoName,playerName,startTime,stopTime,include,notes
+        mock_response.content = b"""videoName,playerName,startTime,stopTime,include,notes
 Game1,Player1,00:00,00:10,true,Great play
 Game1,Player1,00:20,00:30,true,Nice move
 Game1,Player2,00:05,00:15,true,Good defense"""
@@ -995,7 +1110,7 @@ Game1,Player2,00:05,00:15,true,Good defense"""
         assert "Great play" in clips_response.text
 
         # Step 3: Start processing
-        with patch("highlight_cuts.web.BackgroundTasks.add_task") as mock_add_task:
+        with patch("highlight_cuts.web.JOB_EXECUTOR.submit") as mock_submit:
             process_response = client.post(
                 "/process",
                 data={
@@ -1008,12 +1123,12 @@ Game1,Player2,00:05,00:15,true,Good defense"""
 
             assert process_response.status_code == 200
             assert "Processing" in process_response.text
-            mock_add_task.assert_called_once()
+            mock_submit.assert_called_once()
 
     def test_error_recovery_invalid_sheet_then_valid(self):
         """Test recovery from invalid sheet to valid sheet."""
         # First try with invalid sheet
-        with patch("requests.get") as mock_get:
+        with patch("highlight_cuts._http.SESSION.get") as mock_get:
             mock_get.side_effect = Exception("Invalid URL")
             error_response = client.post(
                 "/parse-sheet",
@@ -1023,8 +1138,8 @@ Game1,Player2,00:05,00:15,true,Good defense"""
 
             # Then try with valid sheet
             mock_response = MagicMock()
-            mock_response.text = (
-                "videoName,playerName,startTime,stopTime\nGame1,Player1,00:00,00:10"
+            mock_response.content = (
+                b"videoName,playerName,startTime,stopTime\nGame1,Player1,00:00,00:10"
             )
             mock_get.side_effect = None
             mock_get.return_value = mock_response
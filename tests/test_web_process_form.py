@@ -7,8 +7,8 @@ from unittest.mock import patch
 client = TestClient(app)
 
 
-@patch("highlight_cuts.web.BackgroundTasks.add_task")
-def test_process_form_submission_with_all_fields(mock_add_task):
+@patch("highlight_cuts.web.JOB_EXECUTOR.submit")
+def test_process_form_submission_with_all_fields(mock_submit):
     """Test that /process endpoint accepts all required form fields."""
     response = client.post(
         "/process",
@@ -25,11 +25,11 @@ def test_process_form_submission_with_all_fields(mock_add_task):
     assert 'hx-get="/status-check"' in response.text
 
     # Verify background task was added
-    mock_add_task.assert_called_once()
+    mock_submit.assert_called_once()
 
 
-@patch("highlight_cuts.web.BackgroundTasks.add_task")
-def test_process_form_missing_game(mock_add_task):
+@patch("highlight_cuts.web.JOB_EXECUTOR.submit")
+def test_process_form_missing_game(mock_submit):
     """Test that /process endpoint rejects missing game."""
     response = client.post(
         "/process",
@@ -45,11 +45,11 @@ def test_process_form_missing_game(mock_add_task):
     assert "Error: No game selected" in response.text
 
     # Should NOT call background task
-    mock_add_task.assert_not_called()
+    mock_submit.assert_not_called()
 
 
-@patch("highlight_cuts.web.BackgroundTasks.add_task")
-def test_process_form_missing_player(mock_add_task):
+@patch("highlight_cuts.web.JOB_EXECUTOR.submit")
+def test_process_form_missing_player(mock_submit):
     """Test that /process endpoint rejects missing player."""
     response = client.post(
         "/process",
@@ -65,7 +65,7 @@ def test_process_form_missing_player(mock_add_task):
     assert "Error: No player selected" in response.text
 
     # Should NOT call background task
-    mock_add_task.assert_not_called()
+    mock_submit.assert_not_called()
 
 
 def test_process_form_missing_all_fields():